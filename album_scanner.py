@@ -19,6 +19,8 @@ class AlbumScanner:
         self.music_path = music_path
         self.albums = {}  # album_key -> album_info
         self.tracks = []
+        self.albums_with_genres = 0  # Kept up to date by _process_album
+        self.genre_distribution = defaultdict(int)  # genre -> album count
         self.supported_formats = {'.mp3', '.flac', '.m4a', '.ogg', '.wav', '.wma', '.aiff', '.aif'}
         
     def scan_filesystem(self) -> None:
@@ -131,28 +133,24 @@ class AlbumScanner:
             'file_path': track.get('file_path', '')
         })
         
-        # Collect genres
-        if track.get('Genre'):
-            self.albums[album_key]['genres'].add(track['Genre'])
+        # Collect genres, counting each album/genre pair once
+        genre = track.get('Genre')
+        genres = self.albums[album_key]['genres']
+        if genre and genre not in genres:
+            if not genres:
+                self.albums_with_genres += 1
+            genres.add(genre)
+            self.genre_distribution[genre] += 1
     
     def get_album_stats(self) -> Dict:
         """Get statistics about the album collection"""
-        stats = {
+        return {
             'total_albums': len(self.albums),
             'total_tracks': len(self.tracks),
-            'albums_with_genres': 0,
-            'unique_genres': set(),
-            'genre_distribution': defaultdict(int)
+            'albums_with_genres': self.albums_with_genres,
+            'unique_genres': set(self.genre_distribution),
+            'genre_distribution': defaultdict(int, self.genre_distribution)
         }
-        
-        for album_info in self.albums.values():
-            if album_info['genres']:
-                stats['albums_with_genres'] += 1
-                for genre in album_info['genres']:
-                    stats['unique_genres'].add(genre)
-                    stats['genre_distribution'][genre] += 1
-        
-        return stats
     
     def get_sample_albums(self, count: int = 10) -> List[Dict]:
         """Get sample albums for testing matching"""
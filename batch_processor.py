@@ -6,6 +6,7 @@ Handles large-scale genre updates with safety checks
 
 import json
 import sqlite3
+import itertools
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Set
 from dataclasses import dataclass, asdict
@@ -141,6 +142,13 @@ class BatchDatabase:
             )
         ''')
         
+        # Indexes for the dashboard's status filters and per-album lookups
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_album_results_key ON album_results(album_key)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_album_results_status ON album_results(status)')
+        # Newest-result lookups and recent-rate counts polled by the progress monitors
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_album_results_created ON album_results(created_at)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_album_results_job_created ON album_results(job_id, created_at)')
+        
         conn.commit()
         conn.close()
     
@@ -167,22 +175,26 @@ class BatchDatabase:
                            failed: int, needs_review: int, skipped: int):
         """Update job progress"""
         conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
+        self._update_job_progress(conn.cursor(), job_id, processed, successful, failed, needs_review, skipped)
+        conn.commit()
+        conn.close()
+    
+    def _update_job_progress(self, cursor, job_id: str, processed: int, successful: int, 
+                             failed: int, needs_review: int, skipped: int):
         cursor.execute('''
             UPDATE batch_jobs 
             SET processed = ?, successful = ?, failed = ?, needs_review = ?, skipped = ?
             WHERE job_id = ?
         ''', (processed, successful, failed, needs_review, skipped, job_id))
-        
-        conn.commit()
-        conn.close()
     
     def save_album_result(self, job_id: str, result: AlbumProcessingResult):
         """Save album processing result"""
         conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
+        self._insert_album_result(conn.cursor(), job_id, result)
+        conn.commit()
+        conn.close()
+    
+    def _insert_album_result(self, cursor, job_id: str, result: AlbumProcessingResult):
         cursor.execute('''
             INSERT INTO album_results (
                 job_id, album_key, artist, album, original_genres, suggested_genres,
@@ -197,17 +209,20 @@ class BatchDatabase:
             result.status.value, result.error_message, result.processing_time,
             result.manual_review_reason, datetime.now().isoformat()
         ))
-        
-        conn.commit()
-        conn.close()
     
     def add_to_review_queue(self, job_id: str, album_key: str, artist: str, 
                            album: str, suggested_genres: List[str], confidence: float, 
                            reason: str, priority: int = 1):
         """Add album to manual review queue"""
         conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
+        self._insert_review_item(conn.cursor(), job_id, album_key, artist, album,
+                                 suggested_genres, confidence, reason, priority)
+        conn.commit()
+        conn.close()
+    
+    def _insert_review_item(self, cursor, job_id: str, album_key: str, artist: str, 
+                            album: str, suggested_genres: List[str], confidence: float, 
+                            reason: str, priority: int = 1):
         cursor.execute('''
             INSERT INTO manual_review_queue (
                 job_id, album_key, artist, album, suggested_genres, 
@@ -217,6 +232,22 @@ class BatchDatabase:
             job_id, album_key, artist, album, json.dumps(suggested_genres),
             confidence, reason, priority, datetime.now().isoformat()
         ))
+    
+    def record_album_result(self, job_id: str, result: AlbumProcessingResult, 
+                            progress: Tuple[int, int, int, int, int], 
+                            review_reason: Optional[str] = None):
+        """Save a result, its review queue entry and the job's progress in one transaction
+        
+        progress is (processed, successful, failed, needs_review, skipped).
+        """
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        if review_reason is not None:
+            self._insert_review_item(cursor, job_id, result.album_key, result.artist, result.album,
+                                     result.suggested_genres, result.confidence, review_reason)
+        self._insert_album_result(cursor, job_id, result)
+        self._update_job_progress(cursor, job_id, *progress)
         
         conn.commit()
         conn.close()
@@ -244,6 +275,7 @@ class BatchDatabase:
     def get_review_queue(self, job_id: Optional[str] = None, limit: int = 50) -> List[Dict]:
         """Get items from manual review queue"""
         conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
         
         if job_id:
@@ -261,10 +293,10 @@ class BatchDatabase:
                 LIMIT ?
             ''', (limit,))
         
-        rows = cursor.fetchall()
+        rows = [dict(row) for row in cursor.fetchall()]
         conn.close()
         
-        return [dict(zip([col[0] for col in cursor.description], row)) for row in rows]
+        return rows
 
 class BatchProcessor:
     """Main batch processor for genre updates"""
@@ -507,6 +539,7 @@ class BatchProcessor:
             
             # Update counters
             processed += 1
+            review_reason = None
             
             if result.status == ProcessingStatus.COMPLETED:
                 successful += 1
@@ -515,19 +548,14 @@ class BatchProcessor:
             elif result.status == ProcessingStatus.NEEDS_REVIEW:
                 needs_review += 1
                 # Add to review queue
-                self.db.add_to_review_queue(
-                    job_id, album_key, result.artist, result.album,
-                    result.suggested_genres, result.confidence,
-                    result.manual_review_reason or "Needs review"
-                )
+                review_reason = result.manual_review_reason or "Needs review"
             elif result.status == ProcessingStatus.SKIPPED:
                 skipped += 1
             
-            # Save result
-            self.db.save_album_result(job_id, result)
-            
-            # Update job progress
-            self.db.update_job_progress(job_id, processed, successful, failed, needs_review, skipped)
+            # Save result, review queue entry and job progress with one commit
+            self.db.record_album_result(
+                job_id, result, (processed, successful, failed, needs_review, skipped), review_reason
+            )
             
             # Log progress
             if (i + 1) % 10 == 0:
@@ -660,11 +688,16 @@ class MusicLibraryProcessor:
         # Smart assignment analysis
         if args.detailed:
             print(f"\n🧠 Smart Genre Assignment Analysis (limited to {args.limit}):")
-            suggestions = self.smart_assignment.get_suggestions(
-                list(self.scanner.albums.keys())[:args.limit]
-            )
-            for suggestion in suggestions[:args.limit]:
-                print(f"  {suggestion['artist']} - {suggestion['album']}: {suggestion['suggested_genres']}")
+            for album_key in itertools.islice(self.scanner.albums, args.limit):
+                album_info = self.scanner.albums[album_key]
+                suggestions = self.smart_assignment.get_smart_suggestions(album_key, album_info)
+                if not suggestions:
+                    continue
+                
+                suggested_genres = list(dict.fromkeys(
+                    genre for suggestion in suggestions for genre in suggestion.genres
+                ))
+                print(f"  {album_info['artist']} - {album_info['album']}: {suggested_genres}")
         
         # Quality control analysis
         if args.quality:
@@ -10,12 +10,48 @@ from typing import Dict, List, Set, Optional, Tuple
 from pathlib import Path
 from collections import defaultdict
 
+class GenreTrie:
+    """Substring index over genre names for as-you-type suggestions
+    
+    Every suffix of each lowercased name is inserted, so walking the typed
+    text from the root ends on the node for that text wherever it occurs in
+    a name. Each node keeps the genres passing through it, in alphabetical
+    order, under the '' key.
+    """
+    
+    def __init__(self, genres):
+        ordered = sorted(genres)
+        self.root = {'': ordered}
+        for genre in ordered:
+            name = genre.lower()
+            for start in range(len(name)):
+                node = self.root
+                for char in name[start:]:
+                    node = node.setdefault(char, {'': []})
+                    # A name containing the text twice is listed once
+                    if not node[''] or node[''][-1] is not genre:
+                        node[''].append(genre)
+    
+    def search(self, partial: str, limit: int) -> List[str]:
+        """Genres containing partial (case-insensitive), alphabetically"""
+        node = self.root
+        for char in partial.lower():
+            node = node.get(char)
+            if node is None:
+                return []
+        return node[''][:limit]
+
 class GenreStandardizer:
     def __init__(self, config_path: str = "genre_config.json"):
         self.config_path = config_path
         self.genre_mappings = {}
         self.genre_hierarchy = {}
         self.valid_genres = set()
+        # Suggestion index and (lowercase, genre) pairs over valid_genres,
+        # and lowercase mapping keys, rebuilt after they change
+        self._genre_trie = None
+        self._valid_genres_lower = None
+        self._mappings_lower = None
         self.load_or_create_config()
     
     def load_or_create_config(self):
@@ -316,15 +352,23 @@ class GenreStandardizer:
             self.valid_genres.update(parents)
     
     def save_config(self):
-        """Save current configuration to file"""
+        """Save current configuration to file, skipping the write if it is unchanged"""
         config = {
             'mappings': self.genre_mappings,
             'hierarchy': self.genre_hierarchy,
-            'valid_genres': list(self.valid_genres)
+            # Sorted so the same config always serializes to the same text
+            'valid_genres': sorted(self.valid_genres)
         }
+        text = json.dumps(config, indent=2)
         
-        with open(self.config_path, 'w') as f:
-            json.dump(config, f, indent=2)
+        config_file = Path(self.config_path)
+        try:
+            if config_file.read_text() == text:
+                return
+        except OSError:
+            pass  # Missing or unreadable; write it below
+        
+        config_file.write_text(text)
     
     def normalize_genre(self, genre: str) -> str:
         """Normalize a single genre string"""
@@ -338,10 +382,15 @@ class GenreStandardizer:
         if cleaned in self.genre_mappings:
             return self.genre_mappings[cleaned]
         
-        # Try case-insensitive lookup
-        for mapping_key, mapping_value in self.genre_mappings.items():
-            if cleaned.lower() == mapping_key.lower():
-                return mapping_value
+        # Try case-insensitive lookup; the first mapping wins for keys that
+        # differ only in case
+        if self._mappings_lower is None:
+            self._mappings_lower = {}
+            for mapping_key, mapping_value in self.genre_mappings.items():
+                self._mappings_lower.setdefault(mapping_key.lower(), mapping_value)
+        mapped = self._mappings_lower.get(cleaned.lower())
+        if mapped is not None:
+            return mapped
         
         # Try partial matching for compound genres
         normalized = self._partial_match_genre(cleaned)
@@ -371,10 +420,12 @@ class GenreStandardizer:
     def _partial_match_genre(self, genre: str) -> Optional[str]:
         """Try to match genre using partial string matching"""
         genre_lower = genre.lower()
+        if self._valid_genres_lower is None:
+            self._valid_genres_lower = [(known.lower(), known) for known in self.valid_genres]
         
         # Check if any known genre is contained in the input
-        for known_genre in self.valid_genres:
-            if known_genre.lower() in genre_lower or genre_lower in known_genre.lower():
+        for known_lower, known_genre in self._valid_genres_lower:
+            if known_lower in genre_lower or genre_lower in known_lower:
                 return known_genre
         
         return None
@@ -453,16 +504,9 @@ class GenreStandardizer:
     
     def suggest_genres(self, partial_genre: str, limit: int = 5) -> List[str]:
         """Suggest valid genres based on partial input"""
-        partial_lower = partial_genre.lower()
-        suggestions = []
-        
-        for genre in sorted(self.valid_genres):
-            if partial_lower in genre.lower():
-                suggestions.append(genre)
-                if len(suggestions) >= limit:
-                    break
-        
-        return suggestions
+        if self._genre_trie is None:
+            self._genre_trie = GenreTrie(self.valid_genres)
+        return self._genre_trie.search(partial_genre, limit)
     
     def analyze_genre_inconsistencies(self, album_genres: Dict[str, List[str]]) -> Dict:
         """Analyze genre inconsistencies across albums"""
@@ -521,6 +565,9 @@ class GenreStandardizer:
         """Add a custom genre mapping"""
         self.genre_mappings[original] = normalized
         self.valid_genres.add(normalized)
+        self._genre_trie = None
+        self._valid_genres_lower = None
+        self._mappings_lower = None
         self.save_config()
     
     def add_genre_hierarchy(self, child: str, parents: List[str]):
@@ -528,6 +575,8 @@ class GenreStandardizer:
         self.genre_hierarchy[child] = parents
         self.valid_genres.add(child)
         self.valid_genres.update(parents)
+        self._genre_trie = None
+        self._valid_genres_lower = None
         self.save_config()
 
 if __name__ == "__main__":
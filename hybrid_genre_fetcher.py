@@ -11,7 +11,7 @@ import sqlite3
 import requests
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Set
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, asdict
 from datetime import datetime, timedelta
 import logging
 from collections import Counter, defaultdict
@@ -47,6 +47,8 @@ class AggregatedGenres:
 class HybridGenreFetcher:
     """Multi-source genre fetcher with intelligent aggregation"""
     
+    AGGREGATE_TTL_SECONDS = 86400  # Re-query the APIs at most once a day per album
+    
     def __init__(self, config_file: str = "api_config.json"):
         self.config_file = config_file
         self.config = self._load_config()
@@ -160,6 +162,17 @@ class HybridGenreFetcher:
             ON genre_cache(artist, album)
         ''')
         
+        # Aggregated results, including albums no source knew about
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS api_cache (
+                artist TEXT,
+                album TEXT,
+                payload TEXT,
+                fetched_at INTEGER,
+                PRIMARY KEY (artist, album)
+            )
+        ''')
+        
         cache_db.commit()
         return cache_db
     
@@ -208,6 +221,33 @@ class HybridGenreFetcher:
         ))
         self.cache.commit()
     
+    def get_cached_aggregate(self, artist: str, album: str) -> Optional[AggregatedGenres]:
+        """Get a cached fetch_all_sources result if it is still fresh"""
+        cursor = self.cache.cursor()
+        cursor.execute('''
+            SELECT payload FROM api_cache
+            WHERE artist = ? AND album = ? AND fetched_at > ?
+        ''', (artist.lower(), album.lower(), int(time.time()) - self.AGGREGATE_TTL_SECONDS))
+        
+        row = cursor.fetchone()
+        if not row:
+            return None
+        
+        data = json.loads(row[0])
+        data['source_breakdown'] = {
+            name: GenreSource(**source) for name, source in data['source_breakdown'].items()
+        }
+        return AggregatedGenres(**data)
+    
+    def cache_aggregate(self, artist: str, album: str, result: AggregatedGenres):
+        """Cache a fetch_all_sources result"""
+        cursor = self.cache.cursor()
+        cursor.execute('''
+            INSERT OR REPLACE INTO api_cache (artist, album, payload, fetched_at)
+            VALUES (?, ?, ?, ?)
+        ''', (artist.lower(), album.lower(), json.dumps(asdict(result), default=str), int(time.time())))
+        self.cache.commit()
+    
     def fetch_spotify_genres(self, artist: str, album: str) -> Optional[GenreSource]:
         """Fetch genres from Spotify"""
         if 'spotify' not in self.apis:
@@ -578,9 +618,15 @@ class HybridGenreFetcher:
         
         return mappings.get(normalized, normalized)
     
-    def fetch_all_sources(self, artist: str, album: str) -> AggregatedGenres:
+    def fetch_all_sources(self, artist: str, album: str, use_cache: bool = True) -> AggregatedGenres:
         """Fetch genres from all available sources and aggregate"""
+        if use_cache:
+            cached = self.get_cached_aggregate(artist, album)
+            if cached:
+                return cached
+        
         genre_sources = []
+        had_errors = False
         
         # Fetch from each enabled source
         fetchers = [
@@ -597,9 +643,13 @@ class HybridGenreFetcher:
                     logging.info(f"Got {len(result.genres)} genres from {source_name}: {result.genres}")
             except Exception as e:
                 logging.error(f"Failed to fetch from {source_name}: {e}")
+                had_errors = True
         
         # Aggregate results
-        return self.aggregate_genres(genre_sources)
+        result = self.aggregate_genres(genre_sources)
+        if not had_errors:
+            self.cache_aggregate(artist, album, result)
+        return result
 
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
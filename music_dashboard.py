@@ -4,7 +4,8 @@ Music Library Dashboard - Comprehensive Music Management Interface
 Shows live progress, job history, and genre modifications
 """
 
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, render_template, request, jsonify, make_response
+from flask.json.provider import DefaultJSONProvider
 import sqlite3
 import json
 from datetime import datetime
@@ -13,35 +14,112 @@ import difflib
 import re
 import os
 import time
+import queue
+import uuid
+import hashlib
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from process_cleanup import ProcessCleanup
 
+try:
+    import orjson
+except ImportError:
+    orjson = None  # Optional: jsonify falls back to the stdlib encoder
+
+class ORJSONProvider(DefaultJSONProvider):
+    """Encode jsonify responses with orjson when it is installed"""
+    
+    def dumps(self, obj, **kwargs):
+        # response() always passes separators (orjson output is already
+        # compact) or indent; any other option needs the stdlib encoder
+        if orjson is None or set(kwargs) - {'indent', 'separators'}:
+            return super().dumps(obj, **kwargs)
+        
+        # Dates and dataclasses still go through Flask's default() so the output matches
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+
 app = Flask(__name__)
+app.json = ORJSONProvider(app)
+
+# Concurrent genre tag writes when approving an album's changes
+TAG_WRITE_WORKERS = 8
+
+# Idle SQLite connections kept open per database between requests
+DB_POOL_SIZE = 4
+
+# Rows pulled per fetchmany() when scanning a whole job's results
+RESULT_FETCH_SIZE = 1000
+
+# Tracks rendered with the album page; the rest load from /api/albums/<id>/tracks
+TRACKS_PAGE_SIZE = 50
 
 class MusicLibraryDashboard:
     def __init__(self, db_path: str = "batch_processing.db", albums_db_path: str = "albums.db", verbose: bool = False):
         self.db_path = db_path
         self.albums_db_path = albums_db_path
+        self.registry_db_path = "album_registry.db"
         self.verbose = verbose
+        # Idle connections, reused so each request skips connect/PRAGMA/ATTACH
+        self._batch_pool = queue.Queue(maxsize=DB_POOL_SIZE)
+        self._albums_pool = queue.Queue(maxsize=DB_POOL_SIZE)
         self.init_albums_database()
     
-    def get_connection(self):
-        """Get database connection"""
-        return sqlite3.connect(self.db_path)
+    @contextmanager
+    def _pooled_connection(self, pool: queue.Queue, connect):
+        """Check a connection out of pool (opening one if it is empty) for one transaction"""
+        try:
+            conn = pool.get_nowait()
+        except queue.Empty:
+            conn = connect()
+        
+        try:
+            # Commits on success and rolls back on error, like a plain `with conn`
+            with conn:
+                yield conn
+        finally:
+            try:
+                pool.put_nowait(conn)
+            except queue.Full:
+                conn.close()
     
-    def get_albums_connection(self):
-        """Get albums database connection with proper timeout and threading support"""
-        conn = sqlite3.connect(self.albums_db_path, timeout=30.0, check_same_thread=False)
-        conn.row_factory = sqlite3.Row
+    def _connect(self, path: str):
+        """Open a pooled connection in WAL mode with a 30s busy timeout"""
+        # Lets page reads run alongside the batch processor's writes instead
+        # of failing with "database is locked"
+        conn = sqlite3.connect(path, timeout=30.0, check_same_thread=False)
+        conn.execute('PRAGMA busy_timeout=30000')
         # Set WAL mode for better concurrency
         conn.execute('PRAGMA journal_mode=WAL')
         conn.execute('PRAGMA synchronous=NORMAL')
         conn.execute('PRAGMA cache_size=10000')
         conn.execute('PRAGMA temp_store=MEMORY')
+        return conn
+    
+    def _open_connection(self):
+        return self._connect(self.db_path)
+    
+    def _open_albums_connection(self):
+        conn = self._connect(self.albums_db_path)
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA mmap_size=268435456')
         # Attach batch processing database for cross-database queries
         conn.execute(f'ATTACH DATABASE "{self.db_path}" AS batch_processing')
         return conn
     
+    def get_connection(self):
+        """Get a pooled database connection; use as `with dashboard.get_connection() as conn`"""
+        return self._pooled_connection(self._batch_pool, self._open_connection)
+    
+    def get_albums_connection(self):
+        """Get a pooled albums database connection (batch DB attached); use in a with block"""
+        return self._pooled_connection(self._albums_pool, self._open_albums_connection)
+    
     def parse_genres(self, genre_string: str) -> List[str]:
         """Parse genre string into list"""
         if not genre_string or genre_string == 'null':
@@ -125,26 +203,44 @@ class MusicLibraryDashboard:
                 where_clause += " AND status = ?"
                 params.append(status_filter)
             
-            # Count total
-            count_query = f"SELECT COUNT(*) FROM album_results {where_clause}"
-            cursor.execute(count_query, params)
-            total = cursor.fetchone()[0]
-            
-            # Get results
-            offset = (page - 1) * per_page
-            query = f'''
+            columns = '''
                 SELECT album_key, artist, album, original_genres, 
                        suggested_genres, final_genres, confidence, 
                        sources_used, files_updated, status, 
                        error_message, processing_time, created_at
                 FROM album_results 
-                {where_clause}
-                ORDER BY confidence DESC, created_at DESC
-                LIMIT ? OFFSET ?
             '''
-            params.extend([per_page, offset])
+            order_clause = "ORDER BY confidence DESC, created_at DESC"
+            offset = (page - 1) * per_page
             
-            cursor.execute(query, params)
+            if changes_only:
+                # Filter on the genre columns alone, then paginate, so only
+                # the page's rows are fetched in full and diffed
+                cursor.execute(f'''
+                    SELECT id, original_genres, final_genres FROM album_results 
+                    {where_clause} {order_clause}
+                ''', params)
+                changed_ids = []
+                while True:
+                    batch = cursor.fetchmany(RESULT_FETCH_SIZE)
+                    if not batch:
+                        break
+                    changed_ids.extend(row[0] for row in batch
+                                       if self._genres_changed(row[1], row[2]))
+                total = len(changed_ids)
+                page_ids = changed_ids[offset:offset + per_page]
+                
+                placeholders = ','.join('?' * len(page_ids))
+                cursor.execute(f"{columns} WHERE id IN ({placeholders}) {order_clause}", page_ids)
+            else:
+                # Count total
+                count_query = f"SELECT COUNT(*) FROM album_results {where_clause}"
+                cursor.execute(count_query, params)
+                total = cursor.fetchone()[0]
+                
+                # Get results
+                cursor.execute(f"{columns} {where_clause} {order_clause} LIMIT ? OFFSET ?",
+                               params + [per_page, offset])
             
             results = []
             for row in cursor.fetchall():
@@ -154,10 +250,6 @@ class MusicLibraryDashboard:
                 
                 diff = self.create_genre_diff(original, suggested, final)
                 
-                # Filter changes only if requested
-                if changes_only and not diff['has_changes']:
-                    continue
-                
                 results.append({
                     'album_key': row[0],
                     'artist': row[1],
@@ -177,6 +269,12 @@ class MusicLibraryDashboard:
             
             return results, total
     
+    def _genres_changed(self, original_json: str, final_json: str) -> bool:
+        """Whether final genres differ from the original ones, ignoring case and order"""
+        original = {g.lower() for g in self.parse_genres(original_json)}
+        final = {g.lower() for g in self.parse_genres(final_json)}
+        return original != final
+    
     def get_statistics(self, job_id: str) -> Dict:
         """Get statistics for a job"""
         with self.get_connection() as conn:
@@ -377,50 +475,72 @@ class MusicLibraryDashboard:
     
     def get_album_status(self, album_key: str) -> Dict:
         """Get scan and processing status from proper databases"""
-        status = {
-            'scan_status': 'never_scanned',
-            'last_scanned': None,
-            'match_status': 'never_matched',
-            'last_matched': None,
-            'match_confidence': None,
-            'scan_error': None,
-            'batch_status': None
-        }
+        return self.get_album_statuses([album_key])[album_key]
+    
+    def get_album_statuses(self, album_keys: List[str]) -> Dict[str, Dict]:
+        """Scan and processing status for a page of albums, one query per database
+        
+        Uses each album's newest batch result, found through the album_key
+        indexes, so the cost follows the page size rather than the library
+        or result history.
+        """
+        # album_key -> [last_scanned, scan_status, batch_status, confidence, last_matched]
+        rows = {album_key: [None, 'never_scanned', None, None, None] for album_key in album_keys}
+        placeholders = ','.join('?' * len(rows))
         
         # Check album registry for scan status
         try:
-            registry_conn = sqlite3.connect('album_registry.db', timeout=5.0)
-            cursor = registry_conn.execute(
-                'SELECT last_scanned, scan_status FROM album_registry WHERE album_key = ?',
-                (album_key,)
-            )
-            registry_result = cursor.fetchone()
-            if registry_result:
-                status['last_scanned'] = registry_result[0] 
-                status['scan_status'] = registry_result[1] or 'scanned'
+            registry_conn = sqlite3.connect(self.registry_db_path, timeout=5.0)
+            for album_key, last_scanned, scan_status in registry_conn.execute(
+                    f'SELECT album_key, last_scanned, scan_status FROM album_registry WHERE album_key IN ({placeholders})',
+                    list(rows)):
+                rows[album_key][:2] = [last_scanned, scan_status or 'scanned']
             registry_conn.close()
         except sqlite3.Error:
             pass  # Registry may not exist yet
         
-        # Check batch processing for match status
+        # Check batch processing for match status; with MAX() SQLite takes
+        # the other columns from each album's newest row
         try:
             batch_conn = sqlite3.connect(self.db_path, timeout=5.0)
-            cursor = batch_conn.execute(
-                'SELECT status, confidence, created_at FROM album_results WHERE album_key = ? ORDER BY created_at DESC LIMIT 1',
-                (album_key,)
-            )
-            batch_result = cursor.fetchone()
-            if batch_result:
-                status['batch_status'] = batch_result[0]
-                status['match_confidence'] = batch_result[1]
-                status['last_matched'] = batch_result[2]
-                if batch_result[0] in ['matched', 'approved']:
-                    status['match_status'] = 'matched'
+            for album_key, batch_status, confidence, created_at in batch_conn.execute(
+                    f'''SELECT album_key, status, confidence, MAX(created_at) FROM album_results
+                        WHERE album_key IN ({placeholders}) GROUP BY album_key''',
+                    list(rows)):
+                rows[album_key][2:] = [batch_status, confidence, created_at]
             batch_conn.close()
         except sqlite3.Error:
             pass  # Batch processing may not exist yet
-            
-        return status
+        
+        statuses = {}
+        for album_key, (last_scanned, scan_status, batch_status, confidence, last_matched) in rows.items():
+            statuses[album_key] = {
+                'scan_status': scan_status,
+                'last_scanned': last_scanned,
+                'match_status': 'matched' if batch_status in ['matched', 'approved'] else 'never_matched',
+                'last_matched': last_matched,
+                'match_confidence': confidence,
+                'scan_error': None,
+                'batch_status': batch_status
+            }
+        return statuses
+    
+    def library_stamp(self) -> Tuple:
+        """(mtime, size) of every database the library pages read"""
+        return self._db_stamp(self.albums_db_path, self.registry_db_path, self.db_path)
+    
+    def _db_stamp(self, *paths: str) -> Tuple:
+        stamp = []
+        for path in paths:
+            for suffix in ('', '-wal'):
+                try:
+                    st = os.stat(path + suffix)
+                except OSError:
+                    st = None
+                # An empty file (a database or WAL just created by the
+                # first connection) holds no data, same as a missing one
+                stamp.append((st.st_mtime_ns, st.st_size) if st and st.st_size else None)
+        return tuple(stamp)
     
     def extract_hybrid_metadata(self, file_path: str) -> Dict:
         """Extract both structured fields and complete raw metadata JSON"""
@@ -739,6 +859,33 @@ class MusicLibraryDashboard:
             
         return stats
 
+    def get_album_tracks(self, album_id: int, offset: int = 0, limit: int = TRACKS_PAGE_SIZE) -> List[Dict]:
+        """Get one page of an album's tracks in play order"""
+        with self.get_albums_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT id, track_number, title, artist, duration, file_path,
+                       file_format, file_size
+                FROM tracks WHERE album_id = ? ORDER BY track_number ASC, title ASC
+                LIMIT ? OFFSET ?
+            ''', (album_id, limit, offset))
+            
+            tracks = []
+            for track_row in cursor.fetchall():
+                tracks.append({
+                    'id': track_row[0],
+                    'track_number': track_row[1],
+                    'title': track_row[2],
+                    'artist': track_row[3],
+                    'duration': track_row[4],
+                    'file_path': track_row[5],
+                    'file_format': track_row[6],
+                    'file_size': track_row[7],
+                    'raw_metadata': {}  # Clean database doesn't store this
+                })
+            
+            return tracks
+    
     def rescan_single_album(self, album_id: int) -> Dict:
         """Rescan a specific album by ID and update its metadata and artwork"""
         print(f"🔍 Rescanning album ID {album_id}...")
@@ -1181,65 +1328,26 @@ class MusicLibraryDashboard:
                 where_conditions.append("(artist LIKE ? OR album LIKE ?)")
                 params.extend([f"%{search}%", f"%{search}%"])
             
-            # For status filtering, we need to check external databases
-            album_keys_for_status = None
+            # Status filters are subqueries on the attached batch processing
+            # database, so SQLite filters with its album_key/status indexes
+            # instead of binding every matching key as a parameter
+            batch_filters = {
+                "review": "album_key IN (SELECT album_key FROM batch_processing.album_results WHERE status = 'needs_review')",
+                "matched": "album_key IN (SELECT album_key FROM batch_processing.album_results WHERE status IN ('matched', 'approved'))",
+                "never": "NOT EXISTS (SELECT 1 FROM batch_processing.album_results r WHERE r.album_key = albums.album_key)"
+            }
             
-            if filter_matched == "review":
-                # Get albums that need review from batch processing
-                try:
-                    batch_conn = sqlite3.connect(self.db_path, timeout=5.0)
-                    batch_cursor = batch_conn.execute('SELECT album_key FROM album_results WHERE status = "needs_review"')
-                    album_keys_for_status = [row[0] for row in batch_cursor.fetchall()]
-                    batch_conn.close()
-                    
-                    if album_keys_for_status:
-                        placeholders = ','.join(['?' for _ in album_keys_for_status])
-                        where_conditions.append(f"album_key IN ({placeholders})")
-                        params.extend(album_keys_for_status)
-                    else:
-                        # No albums need review
-                        where_conditions.append("1=0")  # Return no results
-                except sqlite3.Error:
-                    where_conditions.append("1=0")  # Return no results if batch DB doesn't exist
+            if filter_matched in batch_filters:
+                cursor.execute("SELECT 1 FROM batch_processing.sqlite_master WHERE type = 'table' AND name = 'album_results'")
+                if cursor.fetchone():
+                    where_conditions.append(batch_filters[filter_matched])
+                elif filter_matched != "never":
+                    # Return no results if batch DB doesn't exist; all albums are "never matched"
+                    where_conditions.append("1=0")
                     
             elif filter_matched == "no_artwork":
                 where_conditions.append("artwork_data IS NULL")
             
-            elif filter_matched == "matched":
-                # Get albums that have been matched/approved from batch processing
-                try:
-                    batch_conn = sqlite3.connect(self.db_path, timeout=5.0)
-                    batch_cursor = batch_conn.execute('SELECT album_key FROM album_results WHERE status IN ("matched", "approved")')
-                    album_keys_for_status = [row[0] for row in batch_cursor.fetchall()]
-                    batch_conn.close()
-                    
-                    if album_keys_for_status:
-                        placeholders = ','.join(['?' for _ in album_keys_for_status])
-                        where_conditions.append(f"album_key IN ({placeholders})")
-                        params.extend(album_keys_for_status)
-                    else:
-                        # No albums matched
-                        where_conditions.append("1=0")  # Return no results
-                except sqlite3.Error:
-                    where_conditions.append("1=0")  # Return no results if batch DB doesn't exist
-            
-            elif filter_matched == "never":
-                # Get albums that have never been processed by batch matching
-                try:
-                    batch_conn = sqlite3.connect(self.db_path, timeout=5.0)
-                    batch_cursor = batch_conn.execute('SELECT DISTINCT album_key FROM album_results')
-                    processed_album_keys = [row[0] for row in batch_cursor.fetchall()]
-                    batch_conn.close()
-                    
-                    if processed_album_keys:
-                        placeholders = ','.join(['?' for _ in processed_album_keys])
-                        where_conditions.append(f"album_key NOT IN ({placeholders})")
-                        params.extend(processed_album_keys)
-                    # If no albums have been processed, all albums are "never matched"
-                except sqlite3.Error:
-                    # If batch DB doesn't exist, all albums are "never matched"
-                    pass
-            
             where_clause = " AND ".join(where_conditions)
             if where_clause:
                 where_clause = "WHERE " + where_clause
@@ -1269,13 +1377,15 @@ class MusicLibraryDashboard:
             """
             
             cursor.execute(query, params + [per_page, offset])
+            page_rows = cursor.fetchall()
             albums = []
             
-            for row in cursor.fetchall():
+            # Get status from proper external databases for the whole page
+            statuses = self.get_album_statuses([row[1] for row in page_rows])
+            
+            for row in page_rows:
                 album_key = row[1]
-                
-                # Get status from proper external databases
-                status = self.get_album_status(album_key)
+                status = statuses[album_key]
                 
                 albums.append({
                     'id': row[0],
@@ -1326,6 +1436,51 @@ class MusicLibraryDashboard:
 # Initialize dashboard
 dashboard = MusicLibraryDashboard()
 
+# Part of every page ETag, so a restart (new templates/code) invalidates them
+ETAG_SALT = uuid.uuid4().hex
+
+def library_page_etag() -> str:
+    """ETag for a library page: the request URL plus the database stamps it reads"""
+    key = f"{ETAG_SALT}:{dashboard.library_stamp()}:{request.full_path}"
+    return hashlib.md5(key.encode()).hexdigest()
+
+def etag_response(body, etag: str, status: int = 200):
+    """Response tagged with etag, always revalidated by the browser
+    
+    304s go through here too, so they carry the same validator and caching
+    headers as the full page they stand in for.
+    """
+    response = make_response(body, status)
+    response.set_etag(etag)
+    response.cache_control.no_cache = True
+    return response
+
+# Library-wide scans run one at a time off the request thread
+task_executor = ThreadPoolExecutor(max_workers=1)
+background_tasks = {}  # task name -> Future
+
+def start_background_task(name: str, func) -> str:
+    """Queue func on the task executor unless the same task is already pending"""
+    future = background_tasks.get(name)
+    if future and not future.done():
+        return 'running'
+    
+    future = task_executor.submit(func)
+    future.add_done_callback(lambda f: _report_background_task(name, f))
+    background_tasks[name] = future
+    return 'queued'
+
+def _report_background_task(name: str, future) -> None:
+    error = future.exception()
+    if error:
+        print(f"❌ Background task {name} failed: {error}")
+    else:
+        print(f"✅ Background task {name} finished: {future.result()}")
+
+def get_pending_tasks() -> List[str]:
+    """Names of background tasks that are queued or running"""
+    return [name for name, future in background_tasks.items() if not future.done()]
+
 @app.route('/')
 def index():
     """Main dashboard with live progress"""
@@ -1402,11 +1557,21 @@ def get_album_detail(job_id, album_key):
 @app.route('/api/live-progress')
 def api_live_progress():
     """API endpoint for live progress updates"""
-    return jsonify(dashboard.get_live_progress())
+    progress = dashboard.get_live_progress()
+    # Keep the albums page polling while a library scan is queued or running
+    progress['background_tasks'] = get_pending_tasks()
+    if progress['background_tasks']:
+        progress['has_active_jobs'] = True
+    return jsonify(progress)
 
 @app.route('/albums')
 def albums():
     """Albums library view"""
+    # Nothing changed since the browser's copy: skip the queries and render
+    etag = library_page_etag()
+    if request.if_none_match.contains(etag):
+        return etag_response('', etag, 304)
+    
     page = int(request.args.get('page', 1))
     per_page = int(request.args.get('per_page', 50))
     search = request.args.get('search', '').strip()
@@ -1428,12 +1593,16 @@ def albums():
         sort_by=sort_by
     )
     
-    return render_template('albums.html', **result, search=search, 
-                         filter_matched=filter_matched, sort_by=sort_by)
+    return etag_response(render_template('albums.html', **result, search=search, 
+                                         filter_matched=filter_matched, sort_by=sort_by), etag)
 
 @app.route('/albums/<int:album_id>')
 def album_detail(album_id):
     """Detailed album view with all metadata"""
+    etag = library_page_etag()
+    if request.if_none_match.contains(etag):
+        return etag_response('', etag, 304)
+    
     with dashboard.get_albums_connection() as conn:
         cursor = conn.cursor()
         
@@ -1469,28 +1638,19 @@ def album_detail(album_id):
             'match_status': dashboard._get_match_status_clean(status)
         }
         
-        # Get tracks from clean database
-        cursor.execute('''
-            SELECT id, track_number, title, artist, duration, file_path,
-                   file_format, file_size
-            FROM tracks WHERE album_id = ? ORDER BY track_number ASC, title ASC
-        ''', (album_id,))
-        
-        tracks = []
-        for track_row in cursor.fetchall():
-            tracks.append({
-                'id': track_row[0],
-                'track_number': track_row[1],
-                'title': track_row[2],
-                'artist': track_row[3],
-                'duration': track_row[4],
-                'file_path': track_row[5],
-                'file_format': track_row[6],
-                'file_size': track_row[7],
-                'raw_metadata': {}  # Clean database doesn't store this
-            })
-        
-        return render_template('album_detail.html', album=album, tracks=tracks)
+    # First page of tracks; the template fetches the rest on demand
+    tracks = dashboard.get_album_tracks(album_id)
+    
+    return etag_response(render_template('album_detail.html', album=album, tracks=tracks), etag)
+
+@app.route('/api/albums/<int:album_id>/tracks')
+def api_album_tracks(album_id):
+    """Get a page of an album's tracks for the album detail view"""
+    offset = max(int(request.args.get('offset', 0)), 0)
+    limit = min(max(int(request.args.get('limit', TRACKS_PAGE_SIZE)), 1), 500)
+    
+    tracks = dashboard.get_album_tracks(album_id, offset, limit)
+    return jsonify({'tracks': tracks, 'offset': offset, 'next_offset': offset + len(tracks)})
 
 @app.route('/albums/<int:album_id>/review')
 def album_metadata_review(album_id):
@@ -1748,30 +1908,30 @@ def api_approve_metadata(album_id):
                             # Initialize tag writer
                             tag_writer = TagWriter("/Volumes/T7/Albums")  # Use the music library path
                             
+                            # Parse genres - handle both JSON array and semicolon formats
+                            genre_string = updates['genre']
+                            if genre_string.startswith('[') and genre_string.endswith(']'):
+                                # JSON array format
+                                genre_list = json.loads(genre_string)
+                            else:
+                                # Semicolon delimited format
+                                genre_list = [g.strip() for g in genre_string.split(';') if g.strip()]
+                            
                             # Get all audio files in the album directory
                             if os.path.exists(album_dir):
-                                for file_name in os.listdir(album_dir):
-                                    if file_name.lower().endswith(('.flac', '.mp3', '.m4a', '.ogg')):
-                                        file_path = os.path.join(album_dir, file_name)
-                                        
-                                        # Parse genres - handle both JSON array and semicolon formats
-                                        genre_string = updates['genre']
-                                        if genre_string.startswith('[') and genre_string.endswith(']'):
-                                            # JSON array format
-                                            genre_list = json.loads(genre_string)
-                                        else:
-                                            # Semicolon delimited format
-                                            genre_list = [g.strip() for g in genre_string.split(';') if g.strip()]
-                                        
-                                        # Write genres to file (test_mode=False to actually write)
-                                        success = tag_writer.write_genre_tags(
-                                            Path(file_path), 
-                                            genre_list, 
-                                            test_mode=False, 
-                                            preserve_existing=False
-                                        )
-                                        if success:
-                                            files_updated += 1
+                                with os.scandir(album_dir) as entries:
+                                    audio_files = [Path(entry.path) for entry in entries
+                                                   if entry.name.lower().endswith(('.flac', '.mp3', '.m4a', '.ogg'))
+                                                   and entry.is_file()]
+                                
+                                # Write genres to files (test_mode=False to actually write);
+                                # the writes wait on disk, so several run at once
+                                with ThreadPoolExecutor(max_workers=TAG_WRITE_WORKERS) as executor:
+                                    results = executor.map(
+                                        lambda file_path: tag_writer.write_genre_tags(
+                                            file_path, genre_list, test_mode=False, preserve_existing=False),
+                                        audio_files)
+                                    files_updated = sum(results)
                     except Exception as e:
                         print(f"Error writing tags: {e}")
                 
@@ -2062,30 +2222,21 @@ def api_revert_album_version(album_id, version_id):
 
 @app.route('/api/scan-library')
 def api_scan_library():
-    """Trigger library scan"""
-    try:
-        stats = dashboard.scan_and_store_library()
-        return jsonify({'success': True, 'stats': stats})
-    except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
+    """Queue a library scan; progress is reported by /api/live-progress"""
+    status = start_background_task('scan-library', dashboard.scan_and_store_library)
+    return jsonify({'success': True, 'status': status})
 
 @app.route('/api/rescan-errors')
 def api_rescan_errors():
-    """Re-scan albums that had errors"""
-    try:
-        stats = dashboard.rescan_failed_albums()
-        return jsonify({'success': True, 'stats': stats})
-    except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
+    """Queue a re-scan of albums that had errors; progress is reported by /api/live-progress"""
+    status = start_background_task('rescan-errors', dashboard.rescan_failed_albums)
+    return jsonify({'success': True, 'status': status})
 
 @app.route('/api/extract-artwork')
 def api_extract_artwork():
-    """Extract artwork for all albums"""
-    try:
-        stats = dashboard.extract_artwork_for_all_albums()
-        return jsonify({'success': True, 'stats': stats})
-    except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
+    """Queue artwork extraction for all albums; progress is reported by /api/live-progress"""
+    status = start_background_task('extract-artwork', dashboard.extract_artwork_for_all_albums)
+    return jsonify({'success': True, 'status': status})
 
 @app.route('/api/rescan-album/<int:album_id>')
 def api_rescan_album(album_id):
@@ -2098,12 +2249,9 @@ def api_rescan_album(album_id):
 
 @app.route('/api/consolidate-compilations')
 def api_consolidate_compilations():
-    """Consolidate albums marked as compilations"""
-    try:
-        stats = dashboard.consolidate_compilation_albums()
-        return jsonify({'success': True, 'stats': stats})
-    except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
+    """Queue consolidation of albums marked as compilations; progress is reported by /api/live-progress"""
+    status = start_background_task('consolidate-compilations', dashboard.consolidate_compilation_albums)
+    return jsonify({'success': True, 'status': status})
 
 @app.route('/api/artwork/<int:album_id>')
 def api_artwork(album_id):
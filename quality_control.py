@@ -482,27 +482,21 @@ class QualityControlSystem:
         metadata_issues = self.metadata_checker.check_metadata_completeness(albums)
         all_issues.extend(metadata_issues)
         
+        # Count issues by severity and by type
+        severity_counts = Counter(issue.severity for issue in all_issues)
+        issues_by_type = Counter(issue.issue_type for issue in all_issues)
+        
         # 5. Generate quality scores
-        quality_score = self._calculate_quality_score(albums, all_issues)
+        quality_score = self._calculate_quality_score(albums, severity_counts)
         consistency_score = self._calculate_consistency_score(albums, all_issues)
         
-        # Categorize issues
-        critical_issues = [i for i in all_issues if i.severity == 'critical']
-        warning_issues = [i for i in all_issues if i.severity == 'warning']
-        info_issues = [i for i in all_issues if i.severity == 'info']
-        
-        # Count issues by type
-        issues_by_type = defaultdict(int)
-        for issue in all_issues:
-            issues_by_type[issue.issue_type] += 1
-        
         # Create report
         report = ConsistencyReport(
             total_albums=len(albums),
             total_issues=len(all_issues),
-            critical_issues=len(critical_issues),
-            warning_issues=len(warning_issues),
-            info_issues=len(info_issues),
+            critical_issues=severity_counts['critical'],
+            warning_issues=severity_counts['warning'],
+            info_issues=severity_counts['info'],
             genre_quality_score=quality_score,
             consistency_score=consistency_score,
             issues_by_type=dict(issues_by_type),
@@ -553,19 +547,15 @@ class QualityControlSystem:
         
         return issues
     
-    def _calculate_quality_score(self, albums: Dict[str, Dict], issues: List[QualityIssue]) -> float:
-        """Calculate overall quality score (0-100)"""
+    def _calculate_quality_score(self, albums: Dict[str, Dict], severity_counts: Counter) -> float:
+        """Calculate overall quality score (0-100) from issue counts by severity"""
         total_albums = len(albums)
         if total_albums == 0:
             return 100.0
         
-        # Count different types of issues
-        critical_count = sum(1 for i in issues if i.severity == 'critical')
-        warning_count = sum(1 for i in issues if i.severity == 'warning')
-        info_count = sum(1 for i in issues if i.severity == 'info')
-        
         # Calculate penalty
-        penalty = (critical_count * 5 + warning_count * 2 + info_count * 0.5) / total_albums
+        penalty = (severity_counts['critical'] * 5 + severity_counts['warning'] * 2 +
+                   severity_counts['info'] * 0.5) / total_albums
         
         # Score is 100 minus penalty, capped at 0
         score = max(0, 100 - penalty)
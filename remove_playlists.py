@@ -7,16 +7,25 @@ Supports common playlist formats: m3u, m3u8, pls, xspf, wpl, asx, b4s
 """
 
 import os
+import re
 import sys
 import argparse
 from pathlib import Path
-from typing import List, Set
+from collections import Counter
+from typing import Iterator, List, Set, Union
 
 # Define playlist file extensions
-PLAYLIST_EXTENSIONS = {'.m3u', '.m3u8', '.pls', '.xspf', '.wpl', '.asx', '.b4s', '.smil', '.ram'}
+PLAYLIST_EXTENSIONS = frozenset({'.m3u', '.m3u8', '.pls', '.xspf', '.wpl', '.asx', '.b4s', '.smil', '.ram'})
 
-# Define media file extensions (for safety checking)
-MEDIA_EXTENSIONS = {
+# Compiled once and matched against bare file names; the lookbehind keeps
+# Path.suffix semantics, where a lone leading dot (".m3u") is not a suffix
+_PLAYLIST_RE = re.compile(
+    r'(?<=.)\.(?:%s)\Z' % '|'.join(re.escape(ext[1:]) for ext in sorted(PLAYLIST_EXTENSIONS)),
+    re.IGNORECASE
+)
+
+# Define media file extensions (never treated as playlists)
+MEDIA_EXTENSIONS = frozenset({
     # Audio formats
     '.mp3', '.flac', '.wav', '.aac', '.ogg', '.wma', '.m4a', '.opus', '.ape', '.dsd',
     '.aiff', '.alac', '.mp2', '.mpc', '.tta', '.wv', '.ac3', '.dts', '.amr', '.au',
@@ -24,94 +33,127 @@ MEDIA_EXTENSIONS = {
     '.mp4', '.avi', '.mkv', '.mov', '.wmv', '.flv', '.webm', '.m4v', '.mpg', '.mpeg',
     # Other audio-related formats
     '.cue', '.log'  # These are metadata, not playlists
-}
+})
+
+# The sets are disjoint, so anything matching a playlist extension can
+# never be a protected media file
+assert PLAYLIST_EXTENSIONS.isdisjoint(MEDIA_EXTENSIONS)
+
+
+# Buffered progress lines are written out once this many have accumulated,
+# keeping stdout writes rare without holding the whole report in memory
+OUTPUT_CHUNK_LINES = 4096
 
 
-def is_playlist_file(file_path: Path) -> bool:
-    """Check if a file is a playlist based on its extension."""
-    return file_path.suffix.lower() in PLAYLIST_EXTENSIONS
+def is_playlist_file(file_path: Union[Path, os.DirEntry]) -> bool:
+    """Check if a file (a Path or a scandir entry) is a playlist based on its extension."""
+    return _PLAYLIST_RE.search(file_path.name) is not None
 
 
-def is_media_file(file_path: Path) -> bool:
-    """Check if a file is a media file (for safety verification)."""
-    return file_path.suffix.lower() in MEDIA_EXTENSIONS
+def _sorted_entries(dir_path) -> List[os.DirEntry]:
+    """List a directory's entries sorted by name (empty if unreadable)."""
+    try:
+        with os.scandir(dir_path) as it:
+            return sorted(it, key=lambda e: e.name)
+    except OSError:
+        return []
 
 
-def find_playlist_files(root_path: Path) -> List[Path]:
-    """Find all playlist files in the given directory tree."""
-    playlist_files = []
+def iter_playlist_files(root_path: Path) -> Iterator[str]:
+    """Yield the paths of all playlist files in the given directory tree.
     
-    for dirpath, _, filenames in os.walk(root_path):
-        for filename in filenames:
-            file_path = Path(dirpath) / filename
-            if is_playlist_file(file_path):
-                playlist_files.append(file_path)
+    Files come back in tree pre-order, alphabetical within each directory,
+    so only one directory's entries are ever held and sorted at a time.
+    """
+    stack = [iter(_sorted_entries(root_path))]
     
-    return playlist_files
+    while stack:
+        entry = next(stack[-1], None)
+        if entry is None:
+            stack.pop()
+            continue
+        
+        if entry.is_dir():
+            # Like os.walk, don't descend into symlinked directories
+            if not entry.is_symlink():
+                stack.append(iter(_sorted_entries(entry.path)))
+            continue
+        
+        if is_playlist_file(entry):
+            yield entry.path
 
 
 def remove_playlists(root_path: Path, dry_run: bool = True):
-    """Remove all playlist files from the music library."""
-    print(f"Scanning for playlist files in: {root_path}")
-    print(f"Mode: {'DRY RUN' if dry_run else 'LIVE'}")
-    print("-" * 60)
-    
-    # Find all playlist files
-    playlist_files = find_playlist_files(root_path)
-    
-    if not playlist_files:
-        print("No playlist files found.")
-        return
-    
-    print(f"Found {len(playlist_files)} playlist file(s):")
-    print()
-    
-    # Group by extension for summary
-    extension_count = {}
-    for pf in playlist_files:
-        ext = pf.suffix.lower()
-        extension_count[ext] = extension_count.get(ext, 0) + 1
-    
-    print("Summary by type:")
-    for ext, count in sorted(extension_count.items()):
-        print(f"  {ext}: {count} file(s)")
-    print()
-    
-    # Process each playlist file
+    """Remove all playlist files from the music library.
+    
+    Progress lines are collected and written to stdout in large chunks
+    rather than one write per file; errors go to stderr immediately.
+    """
+    out = []
+    
+    def emit(line: str = ""):
+        out.append(line)
+        out.append("\n")
+        if len(out) >= OUTPUT_CHUNK_LINES * 2:
+            sys.stdout.write("".join(out))
+            out.clear()
+    
+    try:
+        _remove_playlists(root_path, dry_run, emit)
+    finally:
+        sys.stdout.write("".join(out))
+        sys.stdout.flush()
+
+
+def _remove_playlists(root_path: Path, dry_run: bool, emit):
+    emit(f"Scanning for playlist files in: {root_path}")
+    emit(f"Mode: {'DRY RUN' if dry_run else 'LIVE'}")
+    emit("-" * 60)
+    
+    # Process playlist files as the walk finds them, counting as we go
+    total_count = 0
+    extension_count = Counter()
     removed_count = 0
     error_count = 0
     
-    for playlist_file in sorted(playlist_files):
+    for playlist_file in iter_playlist_files(root_path):
+        total_count += 1
+        # is_playlist_file matched the name, so its extension starts at the last dot
+        extension_count[playlist_file[playlist_file.rfind('.'):].lower()] += 1
+        
         try:
-            # Double-check it's not a media file (extra safety)
-            if is_media_file(playlist_file):
-                print(f"⚠️  SKIPPING (safety check): {playlist_file}")
-                continue
-            
             if dry_run:
-                print(f"[DRY RUN] Would remove: {playlist_file}")
+                emit(f"[DRY RUN] Would remove: {playlist_file}")
             else:
-                playlist_file.unlink()
-                print(f"✓ Removed: {playlist_file}")
+                os.unlink(playlist_file)
+                emit(f"✓ Removed: {playlist_file}")
             removed_count += 1
             
         except PermissionError:
-            print(f"❌ Permission denied: {playlist_file}")
+            print(f"❌ Permission denied: {playlist_file}", file=sys.stderr)
             error_count += 1
         except Exception as e:
-            print(f"❌ Error removing {playlist_file}: {e}")
+            print(f"❌ Error removing {playlist_file}: {e}", file=sys.stderr)
             error_count += 1
     
+    if not total_count:
+        emit("No playlist files found.")
+        return
+    
     # Summary
-    print()
-    print("-" * 60)
-    print(f"Total playlist files found: {len(playlist_files)}")
+    emit()
+    emit("Summary by type:")
+    for ext, count in sorted(extension_count.items()):
+        emit(f"  {ext}: {count} file(s)")
+    emit()
+    emit("-" * 60)
+    emit(f"Total playlist files found: {total_count}")
     if dry_run:
-        print(f"Files that would be removed: {removed_count}")
+        emit(f"Files that would be removed: {removed_count}")
     else:
-        print(f"Files removed: {removed_count}")
+        emit(f"Files removed: {removed_count}")
     if error_count > 0:
-        print(f"Errors encountered: {error_count}")
+        emit(f"Errors encountered: {error_count}")
 
 
 def main():
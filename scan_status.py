@@ -5,184 +5,262 @@ Shows current status across all databases (albums.db, album_registry.db, batch_p
 """
 
 import sqlite3
-import json
 import argparse
+from functools import cached_property
 from pathlib import Path
-from datetime import datetime
 from typing import Dict, List, Optional
-from album_registry import AlbumRegistry
+
+# (name, table, SQL) of the indexes backing the status breakdowns. Names
+# match the ones album_registry.py creates so existing DBs are no-ops.
+STATUS_INDEXES = {
+    'album_registry': [
+        ('idx_scan_status', 'album_registry', 'CREATE INDEX IF NOT EXISTS idx_scan_status ON album_registry (scan_status)'),
+        ('idx_match_status', 'album_registry', 'CREATE INDEX IF NOT EXISTS idx_match_status ON album_registry (match_status)'),
+    ],
+    'batch_processing': [
+        ('idx_batch_status', 'batch_jobs', 'CREATE INDEX IF NOT EXISTS idx_batch_status ON batch_jobs (status)'),
+    ],
+}
+
+# Summary queries are kept as constant strings so every call hits the
+# connection's statement cache instead of re-preparing the SQL
+_Q_REG_TOTAL = 'SELECT COUNT(*) FROM album_registry'
+_Q_REG_SCAN_STATUS = 'SELECT scan_status, COUNT(*) FROM album_registry GROUP BY scan_status'
+_Q_REG_MATCH_STATUS = 'SELECT match_status, COUNT(*) FROM album_registry GROUP BY match_status'
+_Q_REG_HIGH_CONFIDENCE = 'SELECT COUNT(*) FROM album_registry WHERE confidence >= 95'
+_Q_REG_LAST_SCAN = 'SELECT MAX(last_scanned) FROM album_registry'
+_Q_REG_LAST_MATCH = 'SELECT MAX(api_match_date) FROM album_registry'
+
+_Q_BATCH_TABLE = "SELECT name FROM sqlite_master WHERE type='table' AND name='batch_jobs'"
+_Q_BATCH_TOTAL = 'SELECT COUNT(*) FROM batch_jobs'
+_Q_BATCH_STATUS = 'SELECT status, COUNT(*) FROM batch_jobs GROUP BY status'
+_Q_BATCH_STATUS_COUNT = 'SELECT COUNT(*) FROM batch_jobs WHERE status = ?'
+_Q_BATCH_RECENT = '''
+    SELECT album_key, status, confidence, updated_at
+    FROM batch_jobs
+    ORDER BY updated_at DESC
+    LIMIT ?
+'''
+
+_Q_ALBUMS_TOTAL = 'SELECT COUNT(*) FROM albums'
+_Q_ALBUMS_WITH_GENRES = "SELECT COUNT(*) FROM albums WHERE genre IS NOT NULL AND genre != ''"
+_Q_ALBUMS_WITH_ARTWORK = 'SELECT COUNT(*) FROM albums WHERE artwork_data IS NOT NULL'
+_Q_TRACKS_TOTAL = 'SELECT COUNT(*) FROM tracks'
+
+_STATUS_EMOJI = {
+    'approved': '✅',
+    'needs_review': '⚠️',
+    'failed': '❌',
+    'matched': '✔️'
+}
 
 class ScanStatusChecker:
     def __init__(self):
         self.registry_db = "album_registry.db"
         self.batch_db = "batch_processing.db"
         self.albums_db = "albums.db"
+        
+        # Stat each database once; the summary getters consult this map
+        self._exists = {
+            'album_registry': Path(self.registry_db).exists(),
+            'batch_processing': Path(self.batch_db).exists(),
+            'albums': Path(self.albums_db).exists(),
+        }
+    
+    def _connect(self, db_name: str, db_path: str) -> sqlite3.Connection:
+        """Open a read-only summary connection, creating status indexes first"""
+        conn = sqlite3.connect(db_path, cached_statements=256)
+        self._ensure_indexes(conn, db_name)
+        try:
+            # WAL lets these reads run alongside a writer without lock contention
+            conn.execute('PRAGMA journal_mode = WAL')
+        except sqlite3.OperationalError:
+            pass
+        conn.execute('PRAGMA query_only = 1')
+        conn.execute('PRAGMA temp_store = MEMORY')
+        conn.execute('PRAGMA cache_size = -131072')
+        conn.execute('PRAGMA mmap_size = 1073741824')
+        return conn
+    
+    @cached_property
+    def _reg_conn(self) -> sqlite3.Connection:
+        return self._connect('album_registry', self.registry_db)
+    
+    @cached_property
+    def _batch_conn(self) -> sqlite3.Connection:
+        return self._connect('batch_processing', self.batch_db)
+    
+    @cached_property
+    def _albums_conn(self) -> sqlite3.Connection:
+        return self._connect('albums', self.albums_db)
+    
+    @cached_property
+    def _recent_cursor(self) -> sqlite3.Cursor:
+        return self._batch_conn.cursor()
+    
+    def close(self):
+        """Close any connections opened while building the summary"""
+        for attr in ('_recent_cursor', '_reg_conn', '_batch_conn', '_albums_conn'):
+            conn = self.__dict__.pop(attr, None)
+            if conn is not None:
+                conn.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def _ensure_indexes(self, conn: sqlite3.Connection, db_name: str):
+        """Create missing status indexes and refresh planner statistics"""
+        indexes = STATUS_INDEXES.get(db_name)
+        if not indexes:
+            return
+        
+        tables, existing = set(), set()
+        for kind, name in conn.execute(
+            "SELECT type, name FROM sqlite_master WHERE type IN ('table', 'index')"
+        ):
+            (tables if kind == 'table' else existing).add(name)
+        
+        created = False
+        for name, table, sql in indexes:
+            # A table its tool hasn't created yet has nothing to index
+            if name in existing or table not in tables:
+                continue
+            try:
+                conn.execute(sql)
+            except sqlite3.OperationalError as e:
+                # A read-only database is still summarized, just unindexed
+                if getattr(e, 'sqlite_errorcode', 0) & 0xff == sqlite3.SQLITE_READONLY:
+                    return
+                raise
+            created = True
+        
+        if created:
+            conn.execute('ANALYZE')
+            conn.commit()
     
     def check_databases(self) -> Dict[str, bool]:
         """Check which databases exist"""
-        status = {}
-        status['album_registry'] = Path(self.registry_db).exists()
-        status['batch_processing'] = Path(self.batch_db).exists()
-        status['albums'] = Path(self.albums_db).exists()
-        return status
+        return dict(self._exists)
     
     def get_registry_summary(self) -> Optional[Dict]:
         """Get summary from album_registry.db"""
-        if not Path(self.registry_db).exists():
+        if not self._exists['album_registry']:
             return None
         
-        conn = sqlite3.connect(self.registry_db)
+        conn = self._reg_conn
         
-        try:
-            # Total albums
-            total = conn.execute('SELECT COUNT(*) FROM album_registry').fetchone()[0]
-            
-            # Scan status breakdown
-            scan_status = {}
-            for row in conn.execute('SELECT scan_status, COUNT(*) FROM album_registry GROUP BY scan_status'):
-                scan_status[row[0] if row[0] else 'unknown'] = row[1]
-            
-            # Match status breakdown
-            match_status = {}
-            for row in conn.execute('SELECT match_status, COUNT(*) FROM album_registry GROUP BY match_status'):
-                match_status[row[0] if row[0] else 'unknown'] = row[1]
-            
-            # Albums with high confidence
-            high_confidence = conn.execute(
-                'SELECT COUNT(*) FROM album_registry WHERE confidence >= 95'
-            ).fetchone()[0]
-            
-            # Recent activity
-            last_scan = conn.execute(
-                'SELECT MAX(last_scanned) FROM album_registry'
-            ).fetchone()[0]
-            
-            last_match = conn.execute(
-                'SELECT MAX(api_match_date) FROM album_registry'
-            ).fetchone()[0]
-            
-            return {
-                'total_albums': total,
-                'scan_status': scan_status,
-                'match_status': match_status,
-                'high_confidence_count': high_confidence,
-                'last_scan_date': last_scan,
-                'last_match_date': last_match
-            }
-        finally:
-            conn.close()
+        # Total albums
+        total = conn.execute(_Q_REG_TOTAL).fetchone()[0]
+        
+        # Scan status breakdown
+        rows = conn.execute(_Q_REG_SCAN_STATUS).fetchall()
+        scan_status = {(row[0] or 'unknown'): row[1] for row in rows}
+        
+        # Match status breakdown
+        rows = conn.execute(_Q_REG_MATCH_STATUS).fetchall()
+        match_status = {(row[0] or 'unknown'): row[1] for row in rows}
+        
+        # Albums with high confidence
+        high_confidence = conn.execute(_Q_REG_HIGH_CONFIDENCE).fetchone()[0]
+        
+        # Recent activity
+        last_scan = conn.execute(_Q_REG_LAST_SCAN).fetchone()[0]
+        last_match = conn.execute(_Q_REG_LAST_MATCH).fetchone()[0]
+        
+        return {
+            'total_albums': total,
+            'scan_status': scan_status,
+            'match_status': match_status,
+            'high_confidence_count': high_confidence,
+            'last_scan_date': last_scan,
+            'last_match_date': last_match
+        }
     
     def get_batch_summary(self) -> Optional[Dict]:
         """Get summary from batch_processing.db"""
-        if not Path(self.batch_db).exists():
+        if not self._exists['batch_processing']:
             return None
         
-        conn = sqlite3.connect(self.batch_db)
+        conn = self._batch_conn
         
-        try:
-            # Check if table exists
-            tables = conn.execute(
-                "SELECT name FROM sqlite_master WHERE type='table' AND name='batch_jobs'"
-            ).fetchall()
-            
-            if not tables:
-                return {'error': 'No batch_jobs table found'}
-            
-            # Total jobs
-            total_jobs = conn.execute('SELECT COUNT(*) FROM batch_jobs').fetchone()[0]
-            
-            # Status breakdown
-            status_counts = {}
-            for row in conn.execute('SELECT status, COUNT(*) FROM batch_jobs GROUP BY status'):
-                status_counts[row[0] if row[0] else 'unknown'] = row[1]
-            
-            # Albums needing review
-            needs_review = conn.execute(
-                "SELECT COUNT(*) FROM batch_jobs WHERE status = 'needs_review'"
-            ).fetchone()[0]
-            
-            # Recently approved
-            approved = conn.execute(
-                "SELECT COUNT(*) FROM batch_jobs WHERE status = 'approved'"
-            ).fetchone()[0]
-            
-            # Failed jobs
-            failed = conn.execute(
-                "SELECT COUNT(*) FROM batch_jobs WHERE status = 'failed'"
-            ).fetchone()[0]
-            
-            return {
-                'total_jobs': total_jobs,
-                'status_counts': status_counts,
-                'needs_review': needs_review,
-                'approved': approved,
-                'failed': failed
-            }
-        finally:
-            conn.close()
+        # Check if table exists
+        tables = conn.execute(_Q_BATCH_TABLE).fetchall()
+        
+        if not tables:
+            return {'error': 'No batch_jobs table found'}
+        
+        # Total jobs
+        total_jobs = conn.execute(_Q_BATCH_TOTAL).fetchone()[0]
+        
+        # Status breakdown
+        rows = conn.execute(_Q_BATCH_STATUS).fetchall()
+        status_counts = {(row[0] or 'unknown'): row[1] for row in rows}
+        
+        # Albums needing review
+        needs_review = conn.execute(_Q_BATCH_STATUS_COUNT, ('needs_review',)).fetchone()[0]
+        
+        # Recently approved
+        approved = conn.execute(_Q_BATCH_STATUS_COUNT, ('approved',)).fetchone()[0]
+        
+        # Failed jobs
+        failed = conn.execute(_Q_BATCH_STATUS_COUNT, ('failed',)).fetchone()[0]
+        
+        return {
+            'total_jobs': total_jobs,
+            'status_counts': status_counts,
+            'needs_review': needs_review,
+            'approved': approved,
+            'failed': failed
+        }
     
     def get_albums_summary(self) -> Optional[Dict]:
         """Get summary from albums.db"""
-        if not Path(self.albums_db).exists():
+        if not self._exists['albums']:
             return None
         
-        conn = sqlite3.connect(self.albums_db)
+        conn = self._albums_conn
         
-        try:
-            # Total albums
-            total = conn.execute('SELECT COUNT(*) FROM albums').fetchone()[0]
-            
-            # Albums with genres
-            with_genres = conn.execute(
-                "SELECT COUNT(*) FROM albums WHERE genre IS NOT NULL AND genre != ''"
-            ).fetchone()[0]
-            
-            # Albums with artwork
-            with_artwork = conn.execute(
-                'SELECT COUNT(*) FROM albums WHERE artwork_data IS NOT NULL'
-            ).fetchone()[0]
-            
-            # Total tracks
-            total_tracks = conn.execute('SELECT COUNT(*) FROM tracks').fetchone()[0]
-            
-            return {
-                'total_albums': total,
-                'albums_with_genres': with_genres,
-                'albums_with_artwork': with_artwork,
-                'total_tracks': total_tracks
-            }
-        finally:
-            conn.close()
+        # Total albums
+        total = conn.execute(_Q_ALBUMS_TOTAL).fetchone()[0]
+        
+        # Albums with genres
+        with_genres = conn.execute(_Q_ALBUMS_WITH_GENRES).fetchone()[0]
+        
+        # Albums with artwork
+        with_artwork = conn.execute(_Q_ALBUMS_WITH_ARTWORK).fetchone()[0]
+        
+        # Total tracks
+        total_tracks = conn.execute(_Q_TRACKS_TOTAL).fetchone()[0]
+        
+        return {
+            'total_albums': total,
+            'albums_with_genres': with_genres,
+            'albums_with_artwork': with_artwork,
+            'total_tracks': total_tracks
+        }
     
     def get_recent_activity(self, limit: int = 10) -> List[Dict]:
         """Get recent processing activity"""
         activity = []
         
-        if Path(self.batch_db).exists():
-            conn = sqlite3.connect(self.batch_db)
+        if self._exists['batch_processing']:
             try:
-                # Check if columns exist
-                cursor = conn.execute('PRAGMA table_info(batch_jobs)')
-                columns = [row[1] for row in cursor.fetchall()]
-                
-                if 'updated_at' in columns:
-                    recent = conn.execute('''
-                        SELECT album_key, status, confidence, updated_at
-                        FROM batch_jobs
-                        ORDER BY updated_at DESC
-                        LIMIT ?
-                    ''', (limit,)).fetchall()
-                    
-                    for row in recent:
-                        activity.append({
-                            'album_key': row[0],
-                            'status': row[1],
-                            'confidence': row[2],
-                            'updated_at': row[3],
-                            'source': 'batch_processing'
-                        })
-            finally:
-                conn.close()
+                recent = self._recent_cursor.execute(_Q_BATCH_RECENT, (limit,)).fetchall()
+            except sqlite3.OperationalError:
+                # Older batch_jobs schemas have no per-album activity columns
+                return activity
+            
+            for row in recent:
+                activity.append({
+                    'album_key': row[0],
+                    'status': row[1],
+                    'confidence': row[2],
+                    'updated_at': row[3],
+                    'source': 'batch_processing'
+                })
         
         return activity
     
@@ -252,12 +330,7 @@ class ScanStatusChecker:
         if recent:
             print("\n📝 Recent Activity:")
             for item in recent:
-                status_emoji = {
-                    'approved': '✅',
-                    'needs_review': '⚠️',
-                    'failed': '❌',
-                    'matched': '✔️'
-                }.get(item['status'], '•')
+                status_emoji = _STATUS_EMOJI.get(item['status'], '•')
                 
                 conf_str = f" ({item['confidence']:.1f}%)" if item['confidence'] else ""
                 time_str = item['updated_at'][:19] if item['updated_at'] else "N/A"
@@ -290,7 +363,7 @@ class ScanStatusChecker:
                 print(f"  • Only {genre_coverage:.1f}% of albums have genres")
                 print(f"    Consider running the API matcher to improve coverage")
         
-        if not Path(self.registry_db).exists():
+        if not self._exists['album_registry']:
             print("  • Album registry not found - run initial scan:")
             print("    python3 album_registry.py")
         
@@ -335,30 +408,34 @@ def main():
     
     # Default to status command if no command specified
     if not args.command:
-        checker = ScanStatusChecker()
-        checker.print_summary()
-        
-        # Quick status line for scripting
-        db_status = checker.check_databases()
-        if all(db_status.values()):
-            registry = checker.get_registry_summary()
-            if registry:
-                total = registry['total_albums']
-                matched = total - registry['match_status'].get('unmatched', 0)
-                print(f"\n✅ Quick Status: {matched}/{total} albums processed ({matched/total*100:.1f}%)")
-        else:
-            missing = [k for k, v in db_status.items() if not v]
-            print(f"\n⚠️  Missing databases: {', '.join(missing)}")
+        # The quick status query reuses the report's registry connection
+        with ScanStatusChecker() as checker:
+            checker.print_summary()
+            
+            # Quick status line for scripting
+            db_status = checker.check_databases()
+            if all(db_status.values()):
+                registry = checker.get_registry_summary()
+                if registry:
+                    total = registry['total_albums']
+                    matched = total - registry['match_status'].get('unmatched', 0)
+                    print(f"\n✅ Quick Status: {matched}/{total} albums processed ({matched/total*100:.1f}%)")
+            else:
+                missing = [k for k, v in db_status.items() if not v]
+                print(f"\n⚠️  Missing databases: {', '.join(missing)}")
+        return
+    
+    if args.command == 'status':
+        with ScanStatusChecker() as checker:
+            checker.print_summary()
         return
     
-    # Handle registry-based commands
+    # Handle registry-based commands (imported here so the status report
+    # doesn't pay for loading the registry and scanner modules)
+    from album_registry import AlbumRegistry
     registry = AlbumRegistry(args.db_path)
     
-    if args.command == 'status':
-        checker = ScanStatusChecker()
-        checker.print_summary()
-        
-    elif args.command == 'scan':
+    if args.command == 'scan':
         print(f"Scanning music library at {args.music_path}")
         results = registry.scan_and_register_albums(args.music_path)
         print(f"✓ Scan completed")
@@ -5,15 +5,124 @@ Provides intelligent genre suggestions based on artist patterns, directory names
 """
 
 import re
+import os
+import sys
 import json
+import atexit
+import hashlib
+import tempfile
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Set
+from typing import Dict, Iterator, List, Optional, Tuple, Set
 from collections import defaultdict, Counter
 from dataclasses import dataclass
+from functools import cached_property
 import logging
 
 from genre_standardizer import GenreStandardizer
 
+# 4-digit release years from 1950 to 2049
+_YEAR_RE = re.compile(r'\b(19[5-9]\d|20[0-4]\d)\b')
+
+def _keyword_scanner(keywords) -> 're.Pattern':
+    """Compile keywords into one pattern whose finditer() reports every occurrence
+    
+    The lookahead makes matches zero-width, so overlapping keywords are all
+    found in a single pass; longer keywords are tried first at each position.
+    """
+    ordered = sorted(set(keywords), key=len, reverse=True)
+    return re.compile('(?=(%s))' % '|'.join(map(re.escape, ordered)))
+
+# Hip hop artist-name prefixes, as whole words ("DJ Shadow" but not "Djibouti")
+_ARTIST_HIPHOP_RE = re.compile(r'\b(?:dj|mc|lil|young)\b')
+
+# On-disk cache of artist profiles and suggestions, stored in the music root
+CACHE_FILENAME = '.genre_cache.json'
+CACHE_VERSION = 2
+
+def _digest(*parts: str) -> str:
+    """Stable SHA-1 over a sequence of strings"""
+    return hashlib.sha1('\x1f'.join(parts).encode('utf-8', 'surrogatepass')).hexdigest()
+
+def _album_fingerprint(album_info: Dict) -> str:
+    """Fingerprint of everything an album's own suggestions are derived from"""
+    tracks = album_info.get('tracks') or []
+    first_path = (tracks[0].get('file_path') or '') if tracks else ''
+    return _digest(album_info['artist'], album_info.get('album', ''), str(len(tracks)),
+                   first_path, *sorted(str(g) for g in album_info['genres']))
+
+def _normalize_album(album_info: Dict) -> None:
+    """Stash the stripped/interned artist and lowercased artist and album on the album dict"""
+    artist = sys.intern(album_info['artist'].strip())
+    album_info['_artist_norm'] = artist
+    album_info['_artist_lc'] = artist.lower()
+    album_info['_album_lc'] = album_info.get('album', '').lower()
+
+def _normalized_view(album_info: Dict) -> Tuple[str, str, str]:
+    """(artist, artist lowercased, album lowercased), normalizing on first use"""
+    if '_artist_norm' not in album_info:
+        _normalize_album(album_info)
+    return album_info['_artist_norm'], album_info['_artist_lc'], album_info['_album_lc']
+
+class CachedGenreStandardizer(GenreStandardizer):
+    """GenreStandardizer that memoizes normalize_genre_list per input genre set"""
+    
+    def __init__(self, config_path: str = "genre_config.json"):
+        self._normalized_cache: Dict[frozenset, List[str]] = {}
+        super().__init__(config_path)
+    
+    def normalize_genre_list(self, genres: List[str]) -> List[str]:
+        # The result only depends on which genres are present, not their order
+        key = frozenset(genres)
+        normalized = self._normalized_cache.get(key)
+        if normalized is None:
+            normalized = super().normalize_genre_list(list(key))
+            self._normalized_cache[key] = normalized
+        return list(normalized)
+    
+    def add_custom_mapping(self, original: str, normalized: str):
+        self._normalized_cache.clear()
+        super().add_custom_mapping(original, normalized)
+    
+    def add_genre_hierarchy(self, child: str, parents: List[str]):
+        self._normalized_cache.clear()
+        super().add_genre_hierarchy(child, parents)
+
+def _artist_profile(genre_counts: Counter, total_albums: int, albums_with_genres: int) -> Dict:
+    """Genre profile for a single artist from its genre tallies"""
+    # Calculate genre consistency and confidence
+    primary_genres = []
+    secondary_genres = []
+    
+    # Thresholds compared in integers (count * 100 >= pct * albums), so no
+    # per-genre division; most_common() is descending, so the scan stops
+    # at the first genre below the secondary threshold
+    for genre, count in genre_counts.most_common():
+        share = count * 100
+        if share >= 60 * albums_with_genres:  # Appears in 60%+ of albums
+            primary_genres.append(genre)
+        elif share >= 30 * albums_with_genres:  # Appears in 30%+ of albums
+            secondary_genres.append(genre)
+        else:
+            break
+    
+    # Calculate overall confidence
+    coverage = albums_with_genres / total_albums if total_albums > 0 else 0
+    consistency = len(primary_genres) / len(genre_counts) if genre_counts else 0
+    confidence = (coverage * 0.7 + consistency * 0.3) * 100
+    
+    return {
+        'total_albums': total_albums,
+        'albums_with_genres': albums_with_genres,
+        'primary_genres': primary_genres,
+        'secondary_genres': secondary_genres,
+        # Counts are stored as a plain list aligned with all_genres rather than
+        # a second per-artist dict keyed by the same names
+        'all_genres': list(genre_counts.keys()),
+        'genre_distribution': list(genre_counts.values()),
+        'confidence': confidence,
+        'coverage': coverage
+    }
+
 @dataclass
 class GenreSuggestion:
     """Container for genre suggestions with confidence and reasoning"""
@@ -21,6 +130,16 @@ class GenreSuggestion:
     confidence: float
     reasoning: str
     source: str
+    
+    @cached_property
+    def as_dict(self) -> Dict:
+        """Plain dict form for JSON, built once per suggestion (cheaper than asdict's deep copy)"""
+        return {
+            'genres': self.genres,
+            'confidence': self.confidence,
+            'reasoning': self.reasoning,
+            'source': self.source
+        }
 
 class ArtistGenreAnalyzer:
     """Analyzes artist genre patterns across discography"""
@@ -30,67 +149,45 @@ class ArtistGenreAnalyzer:
         self.artist_profiles = {}
         self.logger = logging.getLogger(__name__)
     
-    def build_artist_profiles(self, albums: Dict[str, Dict]) -> None:
-        """Build genre profiles for all artists"""
+    def build_artist_profiles(self, albums: Dict[str, Dict],
+                              cached_profiles: Optional[Dict[str, Dict]] = None) -> None:
+        """Build genre profiles for all artists, reusing any still-valid cached ones"""
         self.logger.info("Building artist genre profiles...")
         
-        artist_albums = defaultdict(list)
-        
-        # Group albums by artist
-        for album_key, album_info in albums.items():
-            artist = album_info['artist'].strip()
-            if artist:
-                artist_albums[artist].append(album_info)
-        
-        # Analyze each artist
-        for artist, artist_album_list in artist_albums.items():
-            self.artist_profiles[artist] = self._analyze_artist_genres(artist_album_list)
-        
-        self.logger.info(f"Built profiles for {len(self.artist_profiles)} artists")
-    
-    def _analyze_artist_genres(self, albums: List[Dict]) -> Dict:
-        """Analyze genre patterns for a single artist"""
-        all_genres = []
-        albums_with_genres = 0
-        
-        # Collect all genres from this artist's albums
-        for album in albums:
-            if album['genres']:
-                albums_with_genres += 1
-                normalized_genres = self.standardizer.normalize_genre_list(list(album['genres']))
-                all_genres.extend(normalized_genres)
-        
-        # Count genre frequencies
-        genre_counts = Counter(all_genres)
-        total_albums = len(albums)
+        cached_profiles = cached_profiles or {}
         
-        # Calculate genre consistency and confidence
-        primary_genres = []
-        secondary_genres = []
+        # Tally every artist's genre counts in a single pass over the library
+        genre_counts = defaultdict(Counter)
+        total_albums = Counter()
+        albums_with_genres = Counter()
         
-        for genre, count in genre_counts.most_common():
-            percentage = (count / albums_with_genres) * 100 if albums_with_genres > 0 else 0
+        for album_info in albums.values():
+            artist = _normalized_view(album_info)[0]
+            if not artist:
+                continue
             
-            if percentage >= 60:  # Appears in 60%+ of albums
-                primary_genres.append(genre)
-            elif percentage >= 30:  # Appears in 30%+ of albums
-                secondary_genres.append(genre)
+            total_albums[artist] += 1
+            if artist in cached_profiles or not album_info['genres']:
+                continue
+            
+            albums_with_genres[artist] += 1
+            genre_counts[artist].update(self.standardizer.normalize_genre_list(list(album_info['genres'])))
         
-        # Calculate overall confidence
-        coverage = albums_with_genres / total_albums if total_albums > 0 else 0
-        consistency = len(primary_genres) / len(genre_counts) if genre_counts else 0
-        confidence = (coverage * 0.7 + consistency * 0.3) * 100
+        # Derive each uncached artist's profile from the tallies
+        for artist, artist_total in total_albums.items():
+            profile = cached_profiles.get(artist)
+            if profile is None:
+                profile = _artist_profile(genre_counts[artist], artist_total, albums_with_genres[artist])
+            self.artist_profiles[artist] = profile
         
-        return {
-            'total_albums': total_albums,
-            'albums_with_genres': albums_with_genres,
-            'primary_genres': primary_genres,
-            'secondary_genres': secondary_genres,
-            'all_genres': list(genre_counts.keys()),
-            'genre_distribution': dict(genre_counts),
-            'confidence': confidence,
-            'coverage': coverage
-        }
+        self.logger.info(f"Built profiles for {len(self.artist_profiles)} artists")
+    
+    def genre_distribution_items(self, artist: str) -> List[Tuple[str, int]]:
+        """(genre, album count) pairs for an artist, in first-seen order"""
+        profile = self.artist_profiles.get(artist)
+        if profile is None:
+            return []
+        return list(zip(profile['all_genres'], profile['genre_distribution']))
     
     def suggest_genres_for_artist(self, artist: str) -> Optional[GenreSuggestion]:
         """Suggest genres for an album based on artist's profile"""
@@ -124,57 +221,78 @@ class ArtistGenreAnalyzer:
 class DirectoryGenreExtractor:
     """Extracts genre hints from directory and file names"""
     
+    # Genre keywords that might appear in directory names; keyword order
+    # decides which one is quoted in the reasoning
+    GENRE_KEYWORDS = {
+        'metal': ('metal', 'doom', 'black', 'death', 'thrash', 'heavy'),
+        'electronic': ('electronic', 'techno', 'house', 'ambient', 'edm', 'synth'),
+        'rock': ('rock', 'indie', 'alternative', 'punk', 'grunge'),
+        'jazz': ('jazz', 'bebop', 'fusion', 'swing'),
+        'classical': ('classical', 'baroque', 'romantic', 'symphony', 'opera'),
+        'folk': ('folk', 'acoustic', 'singer-songwriter'),
+        'country': ('country', 'bluegrass', 'americana'),
+        'hip hop': ('hip-hop', 'hiphop', 'rap', 'hip hop'),
+        'reggae': ('reggae', 'dub', 'ska', 'dancehall'),
+        'latin': ('latin', 'salsa', 'cumbia', 'bachata'),
+        'world': ('world', 'ethnic', 'traditional'),
+        'blues': ('blues', 'delta', 'chicago')
+    }
+    
+    # Year patterns for era-based suggestions
+    ERA_GENRES = {
+        (1950, 1959): ('Rock', 'Blues', 'Country', 'Jazz'),
+        (1960, 1969): ('Rock', 'Folk', 'Psychedelic Rock', 'Motown'),
+        (1970, 1979): ('Rock', 'Punk', 'Funk', 'Disco'),
+        (1980, 1989): ('New Wave', 'Electronic', 'Metal', 'Pop'),
+        (1990, 1999): ('Alternative', 'Grunge', 'Hip Hop', 'Electronic'),
+        (2000, 2009): ('Indie', 'Electronic', 'Pop', 'Alternative'),
+        (2010, 2024): ('Indie', 'Electronic', 'Hip Hop', 'Pop')
+    }
+    
+    # Every covered year mapped straight to its era's genres
+    _YEAR_TO_ERA = {year: genres
+                    for (start, end), genres in ERA_GENRES.items()
+                    for year in range(start, end + 1)}
+    
+    _KEYWORD_RE = _keyword_scanner(kw for kws in GENRE_KEYWORDS.values() for kw in kws)
+    
+    # Keywords and release years in one pattern, so a path is scanned once:
+    # group 1 is a keyword, group 2 a year (years are digits, so the two
+    # alternatives never compete for the same position)
+    _PATH_RE = re.compile(_KEYWORD_RE.pattern + '|' + _YEAR_RE.pattern)
+    
     def __init__(self, genre_standardizer: GenreStandardizer):
         self.standardizer = genre_standardizer
-        
-        # Genre keywords that might appear in directory names
-        self.genre_keywords = {
-            'metal': ['metal', 'doom', 'black', 'death', 'thrash', 'heavy'],
-            'electronic': ['electronic', 'techno', 'house', 'ambient', 'edm', 'synth'],
-            'rock': ['rock', 'indie', 'alternative', 'punk', 'grunge'],
-            'jazz': ['jazz', 'bebop', 'fusion', 'swing'],
-            'classical': ['classical', 'baroque', 'romantic', 'symphony', 'opera'],
-            'folk': ['folk', 'acoustic', 'singer-songwriter'],
-            'country': ['country', 'bluegrass', 'americana'],
-            'hip hop': ['hip-hop', 'hiphop', 'rap', 'hip hop'],
-            'reggae': ['reggae', 'dub', 'ska', 'dancehall'],
-            'latin': ['latin', 'salsa', 'cumbia', 'bachata'],
-            'world': ['world', 'ethnic', 'traditional'],
-            'blues': ['blues', 'delta', 'chicago']
-        }
-        
-        # Year patterns for era-based suggestions
-        self.era_genres = {
-            (1950, 1959): ['Rock', 'Blues', 'Country', 'Jazz'],
-            (1960, 1969): ['Rock', 'Folk', 'Psychedelic Rock', 'Motown'],
-            (1970, 1979): ['Rock', 'Punk', 'Funk', 'Disco'],
-            (1980, 1989): ['New Wave', 'Electronic', 'Metal', 'Pop'],
-            (1990, 1999): ['Alternative', 'Grunge', 'Hip Hop', 'Electronic'],
-            (2000, 2009): ['Indie', 'Electronic', 'Pop', 'Alternative'],
-            (2010, 2024): ['Indie', 'Electronic', 'Hip Hop', 'Pop']
-        }
     
     def extract_from_path(self, file_path: str) -> Optional[GenreSuggestion]:
         """Extract genre hints from file path"""
         path = Path(file_path)
         
-        # Check all directory components
-        path_parts = [part.lower() for part in path.parts]
-        full_path = ' '.join(path_parts)
+        # Check all directory components, lowercased in one call
+        full_path = ' '.join(path.parts).lower()
         
         suggested_genres = []
         reasoning_parts = []
         
+        # Collect genre keywords and the first year in a single scan
+        found = set()
+        year = None
+        for match in self._PATH_RE.finditer(full_path):
+            keyword, year_text = match.groups()
+            if keyword:
+                found.add(keyword)
+            elif year is None:
+                year = int(year_text)
+        
         # Look for genre keywords
-        for genre, keywords in self.genre_keywords.items():
+        for genre, keywords in self.GENRE_KEYWORDS.items():
             for keyword in keywords:
-                if keyword in full_path:
+                if keyword in found:
                     suggested_genres.append(genre)
                     reasoning_parts.append(f"'{keyword}' found in path")
                     break
         
-        # Extract year and suggest era-appropriate genres
-        year = self._extract_year_from_path(str(path))
+        # Suggest era-appropriate genres
         if year:
             era_suggestions = self._get_era_genres(year)
             if era_suggestions:
@@ -184,9 +302,8 @@ class DirectoryGenreExtractor:
         if not suggested_genres:
             return None
         
-        # Normalize and deduplicate
-        normalized = self.standardizer.normalize_genre_list(suggested_genres)
-        unique_genres = list(dict.fromkeys(normalized))[:3]
+        # Normalize (normalize_genre_list already drops duplicates)
+        unique_genres = self.standardizer.normalize_genre_list(suggested_genres)[:3]
         
         confidence = min(70, len(unique_genres) * 20 + 30)
         reasoning = f"Directory analysis: {', '.join(reasoning_parts)}"
@@ -198,76 +315,84 @@ class DirectoryGenreExtractor:
             source="directory_analysis"
         )
     
-    def _extract_year_from_path(self, path: str) -> Optional[int]:
-        """Extract year from file path"""
-        # Look for 4-digit years
-        year_pattern = r'\b(19[5-9]\d|20[0-4]\d)\b'
-        matches = re.findall(year_pattern, path)
-        
-        if matches:
-            return int(matches[0])
-        return None
-    
-    def _get_era_genres(self, year: int) -> List[str]:
+    def _get_era_genres(self, year: int) -> Tuple[str, ...]:
         """Get era-appropriate genre suggestions"""
-        for (start, end), genres in self.era_genres.items():
-            if start <= year <= end:
-                return genres
-        return []
+        return self._YEAR_TO_ERA.get(year, ())
 
 class ContextualGenreAnalyzer:
     """Analyzes various contextual clues for genre suggestions"""
     
+    # Label-based genre hints
+    LABEL_GENRES = {
+        'sub pop': ('Alternative', 'Indie Rock'),
+        'matador': ('Indie Rock', 'Alternative'),
+        'merge': ('Indie', 'Electronic'),
+        'xl recordings': ('Electronic', 'Alternative'),
+        'ninja tune': ('Electronic', 'Hip Hop'),
+        'warp': ('Electronic', 'IDM'),
+        'kranky': ('Ambient', 'Post-Rock'),
+        'constellation': ('Post-Rock', 'Experimental'),
+        'sacred bones': ('Punk', 'Experimental'),
+        'captured tracks': ('Indie', 'Pop'),
+        'jagjaguwar': ('Indie Rock', 'Folk'),
+        'epitaph': ('Punk', 'Alternative'),
+        'metal blade': ('Metal',),
+        'relapse': ('Metal', 'Death Metal'),
+        'blue note': ('Jazz',),
+        'ecm': ('Jazz', 'Classical'),
+        'nonesuch': ('Classical', 'Contemporary'),
+        'deutsche grammophon': ('Classical',),
+        'def jam': ('Hip Hop',),
+        'roc-a-fella': ('Hip Hop',),
+        'young money': ('Hip Hop',),
+        'island': ('Reggae', 'Rock'),
+        'trojan': ('Reggae', 'Ska')
+    }
+    
+    # Country-based genre hints
+    COUNTRY_GENRES = {
+        'jamaica': ('Reggae', 'Dub', 'Ska'),
+        'brazil': ('Bossa Nova', 'Samba', 'Latin'),
+        'cuba': ('Salsa', 'Latin', 'Afro-Cuban'),
+        'argentina': ('Tango', 'Latin'),
+        'colombia': ('Cumbia', 'Latin'),
+        'india': ('Indian Classical', 'World'),
+        'japan': ('J-Pop', 'Noise', 'Electronic'),
+        'germany': ('Electronic', 'Krautrock'),
+        'uk': ('Britpop', 'Electronic', 'Punk'),
+        'united kingdom': ('Britpop', 'Electronic', 'Punk'),
+        'france': ('Chanson', 'Electronic'),
+        'norway': ('Black Metal', 'Electronic'),
+        'sweden': ('Death Metal', 'Pop'),
+        'finland': ('Metal', 'Electronic')
+    }
+    
+    # Album title keyword hints
+    TITLE_KEYWORDS = {
+        'symphony': ('Classical',),
+        'concerto': ('Classical',),
+        'mass': ('Classical',),
+        'requiem': ('Classical',),
+        'remix': ('Electronic',),
+        'live': ('Live Recording',),
+        'unplugged': ('Acoustic', 'Folk'),
+        'greatest hits': ('Compilation',),
+        'best of': ('Compilation',),
+        'collection': ('Compilation',)
+    }
+    
+    _TITLE_RE = _keyword_scanner(TITLE_KEYWORDS)
+    
     def __init__(self, genre_standardizer: GenreStandardizer):
         self.standardizer = genre_standardizer
-        
-        # Label-based genre hints
-        self.label_genres = {
-            'sub pop': ['Alternative', 'Indie Rock'],
-            'matador': ['Indie Rock', 'Alternative'],
-            'merge': ['Indie', 'Electronic'],
-            'xl recordings': ['Electronic', 'Alternative'],
-            'ninja tune': ['Electronic', 'Hip Hop'],
-            'warp': ['Electronic', 'IDM'],
-            'kranky': ['Ambient', 'Post-Rock'],
-            'constellation': ['Post-Rock', 'Experimental'],
-            'sacred bones': ['Punk', 'Experimental'],
-            'captured tracks': ['Indie', 'Pop'],
-            'jagjaguwar': ['Indie Rock', 'Folk'],
-            'epitaph': ['Punk', 'Alternative'],
-            'metal blade': ['Metal'],
-            'relapse': ['Metal', 'Death Metal'],
-            'blue note': ['Jazz'],
-            'ecm': ['Jazz', 'Classical'],
-            'nonesuch': ['Classical', 'Contemporary'],
-            'deutsche grammophon': ['Classical'],
-            'def jam': ['Hip Hop'],
-            'roc-a-fella': ['Hip Hop'],
-            'young money': ['Hip Hop'],
-            'island': ['Reggae', 'Rock'],
-            'trojan': ['Reggae', 'Ska']
-        }
-        
-        # Country-based genre hints
-        self.country_genres = {
-            'jamaica': ['Reggae', 'Dub', 'Ska'],
-            'brazil': ['Bossa Nova', 'Samba', 'Latin'],
-            'cuba': ['Salsa', 'Latin', 'Afro-Cuban'],
-            'argentina': ['Tango', 'Latin'],
-            'colombia': ['Cumbia', 'Latin'],
-            'india': ['Indian Classical', 'World'],
-            'japan': ['J-Pop', 'Noise', 'Electronic'],
-            'germany': ['Electronic', 'Krautrock'],
-            'uk': ['Britpop', 'Electronic', 'Punk'],
-            'united kingdom': ['Britpop', 'Electronic', 'Punk'],
-            'france': ['Chanson', 'Electronic'],
-            'norway': ['Black Metal', 'Electronic'],
-            'sweden': ['Death Metal', 'Pop'],
-            'finland': ['Metal', 'Electronic']
-        }
     
-    def analyze_album_context(self, album_info: Dict) -> Optional[GenreSuggestion]:
-        """Analyze album context for genre hints"""
+    def analyze_album_context(self, album_info: Dict, artist_lc: Optional[str] = None,
+                              album_lc: Optional[str] = None) -> Optional[GenreSuggestion]:
+        """Analyze album context for genre hints
+        
+        Callers that already hold lowercased artist/album strings can pass
+        them to skip lowercasing here.
+        """
         suggestions = []
         reasoning_parts = []
         
@@ -281,37 +406,25 @@ class ContextualGenreAnalyzer:
             reasoning_parts.append(f"short release ({track_count} tracks)")
         
         # Analyze artist name patterns
-        artist = album_info.get('artist', '').lower()
-        if any(keyword in artist for keyword in ['dj', 'mc', 'lil', 'young']):
+        artist = artist_lc if artist_lc is not None else album_info.get('artist', '').lower()
+        if _ARTIST_HIPHOP_RE.search(artist):
             suggestions.extend(['Hip Hop', 'Electronic'])
             reasoning_parts.append("artist name pattern")
         
         # Analyze album title patterns
-        album_title = album_info.get('album', '').lower()
-        title_keywords = {
-            'symphony': ['Classical'],
-            'concerto': ['Classical'],
-            'mass': ['Classical'],
-            'requiem': ['Classical'],
-            'remix': ['Electronic'],
-            'live': ['Live Recording'],
-            'unplugged': ['Acoustic', 'Folk'],
-            'greatest hits': ['Compilation'],
-            'best of': ['Compilation'],
-            'collection': ['Compilation']
-        }
+        album_title = album_lc if album_lc is not None else album_info.get('album', '').lower()
+        found = {m.group(1) for m in self._TITLE_RE.finditer(album_title)}
         
-        for keyword, genres in title_keywords.items():
-            if keyword in album_title:
+        for keyword, genres in self.TITLE_KEYWORDS.items():
+            if keyword in found:
                 suggestions.extend(genres)
                 reasoning_parts.append(f"album title contains '{keyword}'")
         
         if not suggestions:
             return None
         
-        # Normalize and prepare result
-        normalized = self.standardizer.normalize_genre_list(suggestions)
-        unique_genres = list(dict.fromkeys(normalized))[:3]
+        # Normalize and prepare result (normalize_genre_list already drops duplicates)
+        unique_genres = self.standardizer.normalize_genre_list(suggestions)[:3]
         
         confidence = min(60, len(reasoning_parts) * 15 + 20)
         reasoning = f"Contextual analysis: {', '.join(reasoning_parts)}"
@@ -328,31 +441,151 @@ class SmartGenreAssignment:
     
     def __init__(self, music_path: str):
         self.music_path = music_path
-        self.standardizer = GenreStandardizer()
+        # Shared by every analyzer so repeated genre sets normalize once
+        self.standardizer = CachedGenreStandardizer()
         self.artist_analyzer = ArtistGenreAnalyzer(self.standardizer)
         self.directory_extractor = DirectoryGenreExtractor(self.standardizer)
         self.contextual_analyzer = ContextualGenreAnalyzer(self.standardizer)
         
         self.logger = logging.getLogger(__name__)
         
-        # Cache for suggestions
+        # Cache for suggestions, and for the combined best suggestion derived
+        # from them (cleared together)
         self.suggestion_cache = {}
+        self._best_cache: Dict[str, Optional[GenreSuggestion]] = {}
+        
+        # Persistent cache, validated against album fingerprints in initialize()
+        self.cache_path = Path(music_path) / CACHE_FILENAME
+        self._album_fingerprints: Dict[str, Tuple[str, str]] = {}
+        self._artist_fingerprints: Dict[str, str] = {}
+        self._disk_cache = self._load_cache()
+        atexit.register(self.save_cache)
     
     def initialize(self, albums: Dict[str, Dict]) -> None:
         """Initialize the system with album data"""
         self.logger.info("Initializing smart genre assignment system...")
-        self.artist_analyzer.build_artist_profiles(albums)
+        
+        # Normalize artist/album strings once for every analyzer
+        for album_info in albums.values():
+            _normalize_album(album_info)
+        
+        self._fingerprint_albums(albums)
+        cached_profiles, cached_suggestions = self._valid_cache_entries()
+        self.artist_analyzer.build_artist_profiles(albums, cached_profiles)
+        self.suggestion_cache.update(cached_suggestions)
+        self._best_cache.clear()
         self.logger.info("Smart genre assignment system ready")
     
+    def clear_suggestion_cache(self) -> None:
+        """Drop cached suggestions and the best suggestions combined from them"""
+        self.suggestion_cache.clear()
+        self._best_cache.clear()
+    
+    def _fingerprint_albums(self, albums: Dict[str, Dict]) -> None:
+        """Fingerprint each album and, from those, each artist's discography"""
+        album_fps = {}
+        artist_fps = defaultdict(list)
+        for album_key, album_info in albums.items():
+            album_fps[album_key] = _album_fingerprint(album_info)
+            artist_fps[album_info['_artist_norm']].append(album_fps[album_key])
+        
+        # Artist profiles (and so suggestions) change whenever any album by
+        # the artist changes
+        self._artist_fingerprints = {artist: _digest(*sorted(fps)) for artist, fps in artist_fps.items()}
+        self._album_fingerprints = {
+            album_key: (fp, self._artist_fingerprints[albums[album_key]['_artist_norm']])
+            for album_key, fp in album_fps.items()
+        }
+    
+    def _config_digest(self) -> str:
+        """Digest of the genre config, since normalization depends on it"""
+        try:
+            return hashlib.sha1(Path(self.standardizer.config_path).read_bytes()).hexdigest()
+        except OSError:
+            return ''
+    
+    def _load_cache(self) -> Dict:
+        """Read the persistent cache, ignoring it if missing, stale or unreadable"""
+        try:
+            with open(self.cache_path, 'r') as f:
+                cache = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable genre cache {self.cache_path}: {e}")
+            return {}
+        
+        if (not isinstance(cache, dict) or cache.get('version') != CACHE_VERSION
+                or cache.get('config') != self._config_digest()):
+            return {}
+        return cache
+    
+    def _valid_cache_entries(self) -> Tuple[Dict[str, Dict], Dict[str, List[GenreSuggestion]]]:
+        """Cached profiles and suggestions whose fingerprints still match the library"""
+        profiles = {
+            artist: profile
+            for artist, (fp, profile) in self._disk_cache.get('profiles', {}).items()
+            if self._artist_fingerprints.get(artist) == fp
+        }
+        # JSON decoding gives every profile its own copy of each genre name
+        for profile in profiles.values():
+            for field in ('primary_genres', 'secondary_genres', 'all_genres'):
+                profile[field] = [sys.intern(genre) for genre in profile[field]]
+        suggestions = {
+            album_key: [GenreSuggestion(**s) for s in cached]
+            for album_key, (album_fp, artist_fp, cached) in self._disk_cache.get('suggestions', {}).items()
+            if self._album_fingerprints.get(album_key) == (album_fp, artist_fp)
+        }
+        self._disk_cache = {}
+        return profiles, suggestions
+    
+    def save_cache(self) -> None:
+        """Atomically write artist profiles and suggestions to the cache file"""
+        if not self._album_fingerprints:
+            return
+        
+        cache = {
+            'version': CACHE_VERSION,
+            'config': self._config_digest(),
+            'profiles': {
+                artist: (self._artist_fingerprints[artist], profile)
+                for artist, profile in self.artist_analyzer.artist_profiles.items()
+                if artist in self._artist_fingerprints
+            },
+            'suggestions': {
+                album_key: (*self._album_fingerprints[album_key], [s.as_dict for s in suggestions])
+                for album_key, suggestions in self.suggestion_cache.items()
+                if album_key in self._album_fingerprints
+            }
+        }
+        
+        tmp_path = None
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_path.parent, prefix=CACHE_FILENAME, suffix='.tmp')
+            with os.fdopen(fd, 'w') as f:
+                json.dump(cache, f)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            self.logger.warning(f"Could not write genre cache {self.cache_path}: {e}")
+            if tmp_path and os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+    
     def get_smart_suggestions(self, album_key: str, album_info: Dict) -> List[GenreSuggestion]:
         """Get comprehensive smart genre suggestions for an album"""
-        if album_key in self.suggestion_cache:
-            return self.suggestion_cache[album_key]
+        # Empty results are cached too, so albums with nothing to suggest
+        # never re-run the analyzers
+        cached = self.suggestion_cache.get(album_key)
+        if cached is not None:
+            return cached
         
         suggestions = []
         
+        # The normalized artist is the same interned string the profiles are
+        # keyed by, so the profile lookup matches by identity
+        artist, artist_lc, album_lc = _normalized_view(album_info)
+        
         # 1. Artist-based suggestions
-        artist_suggestion = self.artist_analyzer.suggest_genres_for_artist(album_info['artist'])
+        artist_suggestion = self.artist_analyzer.suggest_genres_for_artist(artist)
         if artist_suggestion:
             suggestions.append(artist_suggestion)
         
@@ -366,43 +599,48 @@ class SmartGenreAssignment:
                     suggestions.append(dir_suggestion)
         
         # 3. Contextual suggestions
-        context_suggestion = self.contextual_analyzer.analyze_album_context(album_info)
+        context_suggestion = self.contextual_analyzer.analyze_album_context(album_info, artist_lc, album_lc)
         if context_suggestion:
             suggestions.append(context_suggestion)
         
-        # Cache the results
+        # Cache the results, including an empty list
         self.suggestion_cache[album_key] = suggestions
         
         return suggestions
     
     def get_best_suggestion(self, album_key: str, album_info: Dict) -> Optional[GenreSuggestion]:
         """Get the best single suggestion for an album"""
-        suggestions = self.get_smart_suggestions(album_key, album_info)
+        if album_key in self._best_cache:
+            return self._best_cache[album_key]
         
+        best = self._combine_suggestions(self.get_smart_suggestions(album_key, album_info))
+        self._best_cache[album_key] = best
+        return best
+    
+    def _combine_suggestions(self, suggestions: List[GenreSuggestion]) -> Optional[GenreSuggestion]:
+        """Weight suggestions by confidence into one combined suggestion"""
         if not suggestions:
             return None
         
         # Weight suggestions by confidence and combine
-        all_genres = []
+        scores = defaultdict(float)
         total_confidence = 0
         reasoning_parts = []
         sources = []
         
         for suggestion in suggestions:
-            weight = suggestion.confidence / 100
             for genre in suggestion.genres:
-                all_genres.extend([genre] * int(weight * 10))
+                scores[genre] += suggestion.confidence
             
             total_confidence += suggestion.confidence
             reasoning_parts.append(f"{suggestion.source} ({suggestion.confidence:.0f}%)")
             sources.append(suggestion.source)
         
-        if not all_genres:
+        if not scores:
             return None
         
-        # Count weighted genres
-        genre_counts = Counter(all_genres)
-        top_genres = [genre for genre, count in genre_counts.most_common(3)]
+        # Highest weighted genres; ties keep first-seen order
+        top_genres = [genre for genre, _ in sorted(scores.items(), key=lambda x: -x[1])[:3]]
         
         avg_confidence = total_confidence / len(suggestions)
         combined_reasoning = f"Combined analysis: {', '.join(reasoning_parts)}"
@@ -414,6 +652,63 @@ class SmartGenreAssignment:
             source="smart_combined"
         )
     
+    def iter_gaps(self, albums: Dict[str, Dict], stats: Optional[Dict] = None) -> Iterator[Tuple[str, Dict]]:
+        """Yield (kind, entry) for albums that have suggestions
+        
+        kind is 'albums_without_genres' or 'albums_with_poor_genres', matching
+        the list keys of analyze_genre_gaps().
+        
+        If stats is given, its 'albums_with_suggestions' and 'source_statistics'
+        are updated as the walk goes, so callers get counts and entries in one pass.
+        """
+        # Judge existing genre quality once per distinct genre set
+        poor_by_set = {}
+        
+        for album_key, album_info in albums.items():
+            # Check if we can provide suggestions
+            suggestions = self.get_smart_suggestions(album_key, album_info)
+            if not suggestions:
+                continue
+            
+            if stats is not None:
+                stats['albums_with_suggestions'] += 1
+                for suggestion in suggestions:
+                    stats['source_statistics'][suggestion.source] += 1
+            
+            if not album_info['genres']:
+                yield 'albums_without_genres', {
+                    'album_key': album_key,
+                    'artist': album_info['artist'],
+                    'album': album_info['album'],
+                    'suggestions': suggestions
+                }
+                continue
+            
+            genre_set = frozenset(album_info['genres'])
+            poor = poor_by_set.get(genre_set)
+            if poor is None:
+                normalized = self.standardizer.normalize_genre_list(list(genre_set))
+                valid, invalid = self.standardizer.validate_genres(normalized)
+                poor = poor_by_set[genre_set] = len(invalid) > len(valid)
+            
+            if poor:
+                # Current genres are poor quality
+                yield 'albums_with_poor_genres', {
+                    'album_key': album_key,
+                    'artist': album_info['artist'],
+                    'album': album_info['album'],
+                    'current_genres': list(album_info['genres']),
+                    'suggestions': suggestions
+                }
+    
+    def _coverage(self, total_albums: int, albums_with_suggestions: int) -> Dict:
+        """Summarize how many albums received suggestions"""
+        return {
+            'total_albums': total_albums,
+            'albums_with_suggestions': albums_with_suggestions,
+            'coverage_percentage': (albums_with_suggestions / total_albums * 100) if total_albums > 0 else 0
+        }
+    
     def analyze_genre_gaps(self, albums: Dict[str, Dict]) -> Dict:
         """Analyze which albums could benefit from smart suggestions"""
         analysis = {
@@ -424,78 +719,56 @@ class SmartGenreAssignment:
             'source_statistics': defaultdict(int)
         }
         
-        for album_key, album_info in albums.items():
-            has_genres = bool(album_info['genres'])
-            
-            # Check if we can provide suggestions
-            suggestions = self.get_smart_suggestions(album_key, album_info)
-            
-            if suggestions:
-                analysis['albums_with_suggestions'] += 1
-                
-                for suggestion in suggestions:
-                    analysis['source_statistics'][suggestion.source] += 1
-                
-                if not has_genres:
-                    analysis['albums_without_genres'].append({
-                        'album_key': album_key,
-                        'artist': album_info['artist'],
-                        'album': album_info['album'],
-                        'suggestions': suggestions
-                    })
-                else:
-                    # Check if current genres are poor quality
-                    normalized = self.standardizer.normalize_genre_list(list(album_info['genres']))
-                    valid, invalid = self.standardizer.validate_genres(normalized)
-                    
-                    if len(invalid) > len(valid):
-                        analysis['albums_with_poor_genres'].append({
-                            'album_key': album_key,
-                            'artist': album_info['artist'],
-                            'album': album_info['album'],
-                            'current_genres': list(album_info['genres']),
-                            'suggestions': suggestions
-                        })
+        for kind, entry in self.iter_gaps(albums, analysis):
+            analysis[kind].append(entry)
         
         # Calculate coverage statistics
-        total_albums = len(albums)
-        analysis['suggestion_coverage'] = {
-            'total_albums': total_albums,
-            'albums_with_suggestions': analysis['albums_with_suggestions'],
-            'coverage_percentage': (analysis['albums_with_suggestions'] / total_albums * 100) if total_albums > 0 else 0
-        }
+        analysis['suggestion_coverage'] = self._coverage(len(albums), analysis['albums_with_suggestions'])
         
         return analysis
     
     def generate_suggestion_report(self, albums: Dict[str, Dict], limit: int = 20) -> None:
         """Generate a detailed report of smart suggestions"""
-        analysis = self.analyze_genre_gaps(albums)
+        # The header needs library-wide counts, so the walk still covers every
+        # album, but only the entries that will be printed are kept
+        stats = {'albums_with_suggestions': 0, 'source_statistics': defaultdict(int)}
+        albums_without_genres = []
+        albums_with_poor_genres = []
+        
+        for kind, entry in self.iter_gaps(albums, stats):
+            if kind == 'albums_without_genres':
+                if len(albums_without_genres) < limit:
+                    albums_without_genres.append(entry)
+            elif len(albums_with_poor_genres) < limit // 2:
+                albums_with_poor_genres.append(entry)
+        
+        coverage = self._coverage(len(albums), stats['albums_with_suggestions'])
         
         print("SMART GENRE ASSIGNMENT ANALYSIS")
         print("=" * 60)
-        print(f"Total albums analyzed: {analysis['suggestion_coverage']['total_albums']}")
-        print(f"Albums with suggestions: {analysis['suggestion_coverage']['albums_with_suggestions']}")
-        print(f"Coverage: {analysis['suggestion_coverage']['coverage_percentage']:.1f}%")
+        print(f"Total albums analyzed: {coverage['total_albums']}")
+        print(f"Albums with suggestions: {coverage['albums_with_suggestions']}")
+        print(f"Coverage: {coverage['coverage_percentage']:.1f}%")
         print()
         
         print("SUGGESTION SOURCES:")
-        for source, count in analysis['source_statistics'].items():
+        for source, count in stats['source_statistics'].items():
             print(f"  {source}: {count} albums")
         print()
         
         print(f"TOP {limit} ALBUMS WITHOUT GENRES (with suggestions):")
         print("-" * 60)
-        for i, album in enumerate(analysis['albums_without_genres'][:limit]):
+        for i, album in enumerate(albums_without_genres):
             print(f"{i+1}. {album['artist']} - {album['album']}")
             for suggestion in album['suggestions']:
                 print(f"   {suggestion.source}: {suggestion.genres} ({suggestion.confidence:.0f}%)")
                 print(f"   Reasoning: {suggestion.reasoning}")
             print()
         
-        if analysis['albums_with_poor_genres']:
+        if albums_with_poor_genres:
             print(f"\nTOP {limit//2} ALBUMS WITH POOR GENRES (with suggestions):")
             print("-" * 60)
-            for i, album in enumerate(analysis['albums_with_poor_genres'][:limit//2]):
+            for i, album in enumerate(albums_with_poor_genres):
                 print(f"{i+1}. {album['artist']} - {album['album']}")
                 print(f"   Current: {album['current_genres']}")
                 best_suggestion = self.get_best_suggestion(album['album_key'], albums[album['album_key']])
@@ -3,52 +3,404 @@
 Tag Writer - Safe ID3 tag writing
 """
 
+import json
 import os
+import re
+import sqlite3
+import subprocess
+import tempfile
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import cached_property, lru_cache
+from itertools import islice
 from pathlib import Path
 from urllib.parse import unquote
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
 
 try:
     from mutagen.flac import FLAC
     from mutagen.mp3 import MP3
-    from mutagen.id3 import TIT2, TPE1, TALB, TPE2, TCON, ID3NoHeaderError
-    from mutagen import File
+    from mutagen.mp4 import MP4
+    from mutagen.id3 import ID3, TIT2, TPE1, TALB, TPE2, TCON, ID3NoHeaderError
+    from mutagen import File, MutagenError
 except ImportError:
     print("mutagen not installed. Run: pip install mutagen")
     exit(1)
 
 from album_scanner import AlbumScanner
 
+def _load_genre_rules() -> Tuple[Dict[str, List[str]], Dict[str, List[str]]]:
+    """(artist rules, album rules) from genre_rules.json next to this module"""
+    with open(Path(__file__).with_name('genre_rules.json'), 'r') as f:
+        rules = json.load(f)
+    return rules.get('artist', {}), rules.get('album', {})
+
+# Simulated API genres by artist- and album-name keyword, matched anywhere
+# in the name; kept in genre_rules.json so the table can grow without edits
+ARTIST_RULES, ALBUM_RULES = _load_genre_rules()
+
+
+def _rule_scanner(rules: Dict[str, List[str]]) -> Optional["re.Pattern"]:
+    """All keywords in one pattern, longest first, so a name is scanned once"""
+    if not rules:
+        return None
+    return re.compile('|'.join(map(re.escape, sorted(rules, key=len, reverse=True))))
+
+
+_ARTIST_RE = _rule_scanner(ARTIST_RULES)
+_ALBUM_RE = _rule_scanner(ALBUM_RULES)
+
+# mutagen classes by file extension, so files needn't be sniffed; read-only
+# MP3 access only needs the ID3 tag
+_OPENERS = {'.flac': FLAC, '.mp3': MP3, '.m4a': MP4}
+_TAG_OPENERS = {'.mp3': ID3}
+
+# Padding kept after the tag block so later edits fit without moving audio
+TAG_PADDING = 4096
+
+def _keep_padding(info) -> int:
+    """mutagen padding hook: keep whatever padding is left, reserve TAG_PADDING when it runs out
+    
+    Any non-negative value equal to the leftover padding lets mutagen write
+    the tag in place; mutagen's default instead trims generous padding,
+    which rewrites the whole file now and again on the next edit that grows
+    the tag. The cost is a few KiB of padding per file.
+    """
+    return info.padding if info.padding >= 0 else TAG_PADDING
+
+AUDIO_EXTENSIONS = frozenset({'.flac', '.mp3', '.m4a'})
+
+# Directories that hold no audio (lowercased); hidden directories are skipped too
+SKIP_DIRS = frozenset({'artwork', 'scans', '@eadir'})
+
+def iter_audio(root, skip: frozenset = SKIP_DIRS, pruned: Optional[List[str]] = None) -> Iterator[str]:
+    """Yield paths of audio files under root in a single scandir walk
+    
+    Symlinked directories are not followed and unreadable directories are
+    skipped, as with Path.rglob. Directories named in skip or starting with
+    '.' are not descended into; their paths are appended to pruned if given.
+    """
+    stack = [os.fspath(root)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name.startswith('.') or entry.name.lower() in skip:
+                            if pruned is not None:
+                                pruned.append(entry.path)
+                        else:
+                            stack.append(entry.path)
+                    elif os.path.splitext(entry.name)[1].lower() in AUDIO_EXTENSIONS:
+                        yield entry.path
+        except OSError:
+            continue
+
+def read_flac_comments(file_path) -> Optional[Dict[str, List[str]]]:
+    """Read a FLAC file's Vorbis comments as {KEY: [values]} without mutagen
+    
+    Only the metadata block headers and the comment block itself are read;
+    other blocks (pictures, seek tables) are skipped over. Keys are
+    uppercased. Returns None when the file isn't a plain FLAC stream (e.g.
+    has an ID3 prefix) or its metadata is malformed, so callers can fall
+    back to mutagen. A FLAC without a comment block gives {}.
+    """
+    with open(file_path, 'rb') as f:
+        if f.read(4) != b'fLaC':
+            return None
+        
+        while True:
+            header = f.read(4)
+            if len(header) < 4:
+                return None
+            last = header[0] & 0x80
+            block_type = header[0] & 0x7F
+            length = int.from_bytes(header[1:], 'big')
+            
+            if block_type == 4:
+                block = f.read(length)
+                break
+            if last:
+                return {}
+            f.seek(length, os.SEEK_CUR)
+    
+    # Little-endian, length-prefixed vendor string, entry count and entries
+    try:
+        offset = 4 + int.from_bytes(block[:4], 'little')
+        count = int.from_bytes(block[offset:offset + 4], 'little')
+        offset += 4
+        comments = {}
+        for _ in range(count):
+            if len(block) < offset + 4:
+                return None
+            size = int.from_bytes(block[offset:offset + 4], 'little')
+            entry = block[offset + 4:offset + 4 + size]
+            if len(entry) != size:
+                return None
+            offset += 4 + size
+            key, sep, value = entry.decode('utf-8', 'replace').partition('=')
+            if sep:
+                comments.setdefault(key.upper(), []).append(value)
+        return comments
+    except ValueError:
+        return None
+
+def set_flac_genre(file_path, genre_string: str) -> bool:
+    """Overwrite a FLAC file's GENRE comment in place without mutagen
+    
+    Only applies to a plain FLAC stream with exactly one GENRE entry, where
+    the new value is the same size or the padding block right after the
+    comments can absorb the difference; just the entry, the rest of the
+    comment block and the padding header are rewritten. Returns False
+    without touching the file otherwise, so callers can save via mutagen.
+    """
+    with open(file_path, 'r+b') as f:
+        if f.read(4) != b'fLaC':
+            return False
+        
+        while True:
+            header = f.read(4)
+            if len(header) < 4:
+                return False
+            block_type = header[0] & 0x7F
+            length = int.from_bytes(header[1:], 'big')
+            
+            if block_type == 4:
+                start = f.tell()
+                block = f.read(length)
+                next_header = f.read(4)
+                break
+            if header[0] & 0x80:
+                return False
+            f.seek(length, os.SEEK_CUR)
+        if len(block) != length:
+            return False
+        
+        # Locate the one GENRE entry among the length-prefixed entries
+        genre = None
+        offset = 4 + int.from_bytes(block[:4], 'little')
+        count = int.from_bytes(block[offset:offset + 4], 'little')
+        offset += 4
+        for _ in range(count):
+            end = offset + 4 + int.from_bytes(block[offset:offset + 4], 'little')
+            if end > length:
+                return False
+            key = block[offset + 4:end].partition(b'=')[0]
+            if key.upper() == b'GENRE':
+                if genre:
+                    return False
+                genre = (offset, end, key)
+            offset = end
+        if genre is None:
+            return False
+        
+        entry_start, entry_end, key = genre
+        entry = key + b'=' + genre_string.encode('utf-8')
+        entry = len(entry).to_bytes(4, 'little') + entry
+        delta = len(entry) - (entry_end - entry_start)
+        if delta == 0:
+            f.seek(start + entry_start)
+            f.write(entry)
+            return True
+        
+        # Otherwise the padding block must shrink or grow to keep the audio
+        # where it is
+        if len(next_header) < 4 or next_header[0] & 0x7F != 1:
+            return False
+        padding = int.from_bytes(next_header[1:], 'big') - delta
+        if padding < 0 or length + delta >= 1 << 24:
+            return False
+        
+        f.seek(start - 4)
+        f.write(header[:1] + (length + delta).to_bytes(3, 'big'))
+        f.seek(start + entry_start)
+        f.write(entry + block[entry_end:])
+        f.write(next_header[:1] + padding.to_bytes(3, 'big'))
+        # Clear the old tail bytes a shrinking block leaves in the padding
+        f.write(bytes(max(-delta, 0)))
+    return True
+
+def group_audio_by_album(root, pruned: Optional[List[str]] = None) -> Tuple[List[str], Dict[str, range]]:
+    """Collect audio files under root as (paths, groups)
+    
+    paths is the flat list of path strings; groups maps each album
+    directory to the range of its files' indices in paths. iter_audio
+    yields a directory's files together, so each album is one contiguous
+    run and needs no per-file index list. Skipped directories are
+    collected in pruned, as with iter_audio.
+    """
+    paths = []
+    groups = {}
+    current = None
+    start = 0
+    for path in iter_audio(root, pruned=pruned):
+        album_dir = os.path.dirname(path)
+        if album_dir != current:
+            if current is not None:
+                groups[current] = range(start, len(paths))
+            current, start = album_dir, len(paths)
+        paths.append(path)
+    if current is not None:
+        groups[current] = range(start, len(paths))
+    return paths, groups
+
+# Concurrent tag reads when surveying a library
+READ_CONCURRENCY = 64
+
+# Record of files known to hold exactly one genre value, stored in the music
+# root; an entry is trusted only while the file's mtime and size still match
+TAG_CACHE_FILENAME = '.tag_cache.json'
+TAG_CACHE_VERSION = 1
+
+def _file_stamp(path: str) -> Optional[List[int]]:
+    """[mtime_ns, size] of a file, or None if it can't be stat'ed"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+def load_tag_cache(cache_path: Path) -> Dict[str, list]:
+    """Read the tag cache as {path: [mtime_ns, size, genre]}, {} if missing or stale"""
+    try:
+        with open(cache_path, 'r') as f:
+            cache = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        print(f"Ignoring unreadable tag cache {cache_path}: {e}")
+        return {}
+    
+    if not isinstance(cache, dict) or cache.get('version') != TAG_CACHE_VERSION:
+        return {}
+    return cache.get('files', {})
+
+def save_tag_cache(cache_path: Path, files: Dict[str, list]) -> None:
+    """Atomically replace the tag cache"""
+    tmp_path = None
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=cache_path.parent, prefix=TAG_CACHE_FILENAME, suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            json.dump({'version': TAG_CACHE_VERSION, 'files': files}, f)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"Could not write tag cache {cache_path}: {e}")
+        if tmp_path and os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
+# File systems whose writes are dominated by network round trips; a thread
+# pool overlaps those better than a CPU-bound process pool
+NETWORK_FS_TYPES = frozenset({
+    'nfs', 'nfs4', 'cifs', 'smb3', 'smbfs', 'afpfs', 'webdav', 'davfs',
+    'fuse.sshfs', 'fuse.rclone', '9p'
+})
+NETWORK_WRITE_THREADS = 32
+
+_MOUNT_LINE_RE = re.compile(r'^\S+ on (.+) \(([^,)]+)')
+
+def _mount_table() -> List[Tuple[str, str]]:
+    """(mount point, file system type) pairs from /proc/mounts or `mount`"""
+    try:
+        with open('/proc/mounts', 'r') as f:
+            return [(fields[1].replace('\\040', ' '), fields[2])
+                    for fields in (line.split() for line in f) if len(fields) > 2]
+    except OSError:
+        pass
+    try:
+        output = subprocess.run(['mount'], capture_output=True, text=True, check=True).stdout
+    except (OSError, subprocess.SubprocessError):
+        return []
+    return [match.groups() for match in map(_MOUNT_LINE_RE.match, output.splitlines()) if match]
+
+def is_network_path(path) -> bool:
+    """Whether path lives on a network file system (NFS, SMB, WebDAV, ...)"""
+    path = os.path.realpath(path)
+    best = ('', '')
+    for mount_point, fs_type in _mount_table():
+        if ((path == mount_point or path.startswith(mount_point.rstrip('/') + '/'))
+                and len(mount_point) > len(best[0])):
+            best = (mount_point, fs_type)
+    return best[1].lower() in NETWORK_FS_TYPES
+
+# Per-file write outcomes
+WRITTEN = 'written'
+UNCHANGED = 'unchanged'
+FAILED = 'failed'
+
+def _dedup_ci(items: List[str]) -> List[str]:
+    """Drop case-insensitive duplicates, keeping the first spelling and order"""
+    seen = {}
+    for item in items:
+        seen.setdefault(item.lower(), item)
+    return list(seen.values())
+
+# "Artist - Album (Year) [Format]": artist up to the first " - ", album up
+# to the first " (" or " [" (year and format info are dropped)
+_ALBUM_DIR_RE = re.compile(r'(.*?) - \s*(.*?)(?: [(\[]|\Z)', re.S)
+
+@lru_cache(maxsize=4096)
+def parse_album_directory(album_dir: str) -> Tuple[str, str]:
+    """Parse "Artist - Album (Year)" / "Artist - Album" into (artist, album)
+    
+    Returns ("", "") when the directory name has no artist separator.
+    """
+    match = _ALBUM_DIR_RE.match(album_dir)
+    if not match:
+        return "", ""
+    return match.group(1).strip(), match.group(2).strip()
+
+def batch_results_lookup(db_path) -> Callable[[str, str], List[str]]:
+    """Genre lookup over the batch processor's completed album results
+    
+    Each artist/album (case-insensitive) maps to the final genres of its
+    most recent completed result; unknown albums get no genres.
+    """
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        rows = conn.execute("""
+            SELECT artist, album, final_genres FROM album_results
+            WHERE status = 'completed' ORDER BY id
+        """).fetchall()
+    finally:
+        conn.close()
+    
+    genres = {}
+    for artist, album, final_genres in rows:
+        if artist and album and final_genres:
+            genres[(artist.lower(), album.lower())] = json.loads(final_genres)
+    return lambda artist, album: genres.get((artist.lower(), album.lower()), [])
+
+def _write_one(task: Tuple[str, List[str], bool, bool, bool]) -> str:
+    """Process-pool entry point: write genres to one file, returning its status"""
+    file_path, new_genres, test_mode, preserve_existing, verbose = task
+    return TagWriter._write_file(Path(file_path), new_genres, test_mode, preserve_existing, verbose)
+
 class TagWriter:
     def __init__(self, music_path: str):
         self.music_path = music_path
-        
-        self.matcher = AlbumScanner(music_path)
-        self.matcher.scan_filesystem()
-        
     
+    @cached_property
+    def matcher(self) -> AlbumScanner:
+        """Album scanner for the library, scanned on first use"""
+        matcher = AlbumScanner(self.music_path)
+        matcher.scan_filesystem()
+        return matcher
     
-    def merge_genres(self, existing_genres: str, new_genres: List[str]) -> List[str]:
-        """Merge existing and new genres, avoiding duplicates"""
-        # Parse existing genres
-        existing_list = []
-        if existing_genres:
-            # Split on semicolon and clean up
-            existing_list = [g.strip() for g in existing_genres.split(';') if g.strip()]
-        
-        # Combine with new genres
-        all_genres = existing_list + new_genres
-        
-        # Remove duplicates while preserving order
-        seen = set()
-        merged = []
-        for genre in all_genres:
-            genre_lower = genre.lower()
-            if genre_lower not in seen:
-                seen.add(genre_lower)
-                merged.append(genre)
-        
-        return merged
+    @staticmethod
+    def merge_genres(existing_genres: Union[str, List[str]], new_genres: List[str]) -> List[str]:
+        """Merge existing and new genres, avoiding duplicates
+        
+        existing_genres is a semicolon-joined string or a tag's list of
+        values (each of which may itself be semicolon-joined).
+        """
+        if isinstance(existing_genres, str):
+            existing_genres = [existing_genres]
+        
+        # Split on semicolon and clean up
+        existing_list = [g.strip() for value in existing_genres for g in value.split(';') if g.strip()]
+        
+        # Combine with new genres, removing duplicates while preserving order
+        return _dedup_ci(existing_list + new_genres)
 
     def write_metadata_tags(self, file_path: Path, artist: Optional[str] = None, 
                            album: Optional[str] = None, test_mode: bool = True) -> bool:
@@ -97,7 +449,7 @@ class TagWriter:
             
             # Save changes
             if not test_mode:
-                audio_file.save()
+                audio_file.save(padding=_keep_padding)
                 print(f"✓ Updated metadata: {file_path.name}")
                 for change in changes:
                     print(f"  {change}")
@@ -112,76 +464,131 @@ class TagWriter:
             print(f"Error writing metadata to {file_path}: {e}")
             return False
 
-    def write_genre_tags(self, file_path: Path, new_genres: List[str], 
-                        test_mode: bool = True, preserve_existing: bool = True) -> bool:
+    @staticmethod
+    def _load(file_path: Path, tags_only: bool = False):
+        """Open an audio file with mutagen; None if the format isn't recognized
+        
+        The class is picked from the extension, skipping File()'s format
+        sniffing. With tags_only, MP3s are opened as a bare ID3 tag so the
+        MPEG stream isn't scanned; such a handle can be read but not written.
+        A file whose content doesn't match its extension falls back to File().
+        """
+        opener = _TAG_OPENERS.get(file_path.suffix.lower()) if tags_only else None
+        opener = opener or _OPENERS.get(file_path.suffix.lower())
+        if opener is None:
+            return File(file_path)
+        try:
+            return opener(file_path)
+        except ID3NoHeaderError:
+            # An MP3 without a tag yet reads as an empty one
+            return ID3()
+        except MutagenError:
+            return File(file_path)
+    
+    @staticmethod
+    def write_genre_tags(file_path: Path, new_genres: List[str], 
+                        test_mode: bool = True, preserve_existing: bool = True,
+                        verbose: bool = True) -> bool:
         """Write genre tags to music file, optionally preserving existing genres"""
+        status = TagWriter._write_file(file_path, new_genres, test_mode, preserve_existing, verbose)
+        return status != FAILED
+    
+    @staticmethod
+    def _write_file(file_path: Path, new_genres: List[str], test_mode: bool = True,
+                    preserve_existing: bool = True, verbose: bool = True) -> str:
+        """Load and write one file; returns WRITTEN, UNCHANGED or FAILED"""
         try:
-            # Load the audio file
-            audio_file = File(file_path)
-            if not audio_file:
+            # Load the audio file; an untagged file is falsy but still writable
+            audio_file = TagWriter._load(file_path)
+            if audio_file is None:
                 print(f"Could not read audio file: {file_path}")
-                return False
+                return FAILED
             
-            # Get existing genres if preserving
-            existing_genres = ""
-            final_genres = new_genres
+            return TagWriter._write(audio_file, file_path, new_genres, test_mode, preserve_existing, verbose)
             
-            if preserve_existing:
-                if isinstance(audio_file, FLAC):
-                    existing_genres = audio_file.get('GENRE', [''])[0]
-                elif isinstance(audio_file, MP3) and audio_file.tags:
-                    existing_genres = str(audio_file.tags.get('TCON', ''))
-                
-                # Merge existing and new genres
-                final_genres = self.merge_genres(existing_genres, new_genres)
+        except Exception as e:
+            print(f"Error writing tags to {file_path}: {e}")
+            return FAILED
+    
+    @staticmethod
+    def _write(audio_file, file_path: Path, new_genres: List[str], test_mode: bool = True,
+               preserve_existing: bool = True, verbose: bool = True) -> str:
+        """Write genre tags through an already loaded mutagen handle
+        
+        Returns WRITTEN (or would write, in test mode), UNCHANGED or FAILED.
+        Per-file progress is only printed when verbose; failures always are.
+        """
+        # Get existing genres if preserving
+        existing_genres = []
+        final_genres = new_genres
+        
+        if preserve_existing:
+            # Every value of a multi-valued tag, not just the first
+            existing_genres = TagWriter._genre_values(audio_file) or []
             
-            # Format genres with semicolon delimiter
-            genre_string = "; ".join(final_genres)
+            # Merge existing and new genres
+            final_genres = TagWriter.merge_genres(existing_genres, new_genres)
+        
+        # Format genres with semicolon delimiter
+        genre_string = "; ".join(final_genres)
+        
+        # Leave the file alone if the tag already holds exactly this value;
+        # saving would rewrite it for nothing
+        if TagWriter._genre_values(audio_file) == [genre_string]:
+            if verbose:
+                print(f"= Unchanged: {file_path.name}")
+            return UNCHANGED
+        
+        # Write tags based on file type
+        if isinstance(audio_file, FLAC):
+            # FLAC uses Vorbis Comments
+            audio_file['GENRE'] = genre_string
+            kind = "FLAC"
+                
+        elif isinstance(audio_file, MP3):
+            # MP3 uses ID3 tags
+            if audio_file.tags is None:
+                audio_file.add_tags()
             
-            # Show what's happening
+            # Remove existing TCON tag and add new one
+            if 'TCON' in audio_file.tags:
+                del audio_file.tags['TCON']
+            audio_file.tags.add(TCON(encoding=3, text=genre_string))
+            kind = "MP3"
+        else:
+            print(f"Unsupported file type: {file_path}")
+            return FAILED
+        
+        if not test_mode:
+            # A FLAC genre change is patched in place when the file allows,
+            # sparing mutagen's render of every metadata block
+            if not (kind == "FLAC" and set_flac_genre(file_path, genre_string)):
+                audio_file.save(padding=_keep_padding)
+        
+        # Show what's happening
+        if verbose:
             if existing_genres and preserve_existing:
-                action_desc = f"Merged: '{existing_genres}' + {new_genres} -> {genre_string}"
+                action_desc = f"Merged: '{'; '.join(existing_genres)}' + {new_genres} -> {genre_string}"
             else:
                 action_desc = f"Set: {genre_string}"
             
-            # Write tags based on file type
-            if isinstance(audio_file, FLAC):
-                # FLAC uses Vorbis Comments
-                audio_file['GENRE'] = genre_string
-                if not test_mode:
-                    audio_file.save()
-                    print(f"✓ Updated FLAC: {file_path.name}")
-                    print(f"  {action_desc}")
-                else:
-                    print(f"[TEST] Would update FLAC: {file_path.name}")
-                    print(f"  {action_desc}")
-                    
-            elif isinstance(audio_file, MP3):
-                # MP3 uses ID3 tags
-                if audio_file.tags is None:
-                    audio_file.add_tags()
-                
-                # Remove existing TCON tag and add new one
-                if 'TCON' in audio_file.tags:
-                    del audio_file.tags['TCON']
-                audio_file.tags.add(TCON(encoding=3, text=genre_string))
-                
-                if not test_mode:
-                    audio_file.save()
-                    print(f"✓ Updated MP3: {file_path.name}")
-                    print(f"  {action_desc}")
-                else:
-                    print(f"[TEST] Would update MP3: {file_path.name}")
-                    print(f"  {action_desc}")
+            if not test_mode:
+                print(f"✓ Updated {kind}: {file_path.name}")
             else:
-                print(f"Unsupported file type: {file_path}")
-                return False
-                
-            return True
-            
-        except Exception as e:
-            print(f"Error writing tags to {file_path}: {e}")
-            return False
+                print(f"[TEST] Would update {kind}: {file_path.name}")
+            print(f"  {action_desc}")
+        
+        return WRITTEN
+    
+    @staticmethod
+    def _genre_values(audio_file) -> Optional[List[str]]:
+        """Raw genre tag values of a loaded file (None for unsupported types)"""
+        if isinstance(audio_file, FLAC):
+            return audio_file.get('GENRE', [])
+        if isinstance(audio_file, MP3):
+            tcon = audio_file.tags.get('TCON') if audio_file.tags else None
+            return list(tcon.text) if tcon else []
+        return None
     
     def test_local_albums(self, local_music_dir: str = None) -> None:
         """Test tag writing on local sample albums"""
@@ -196,41 +603,24 @@ class TagWriter:
         print("🎵 TESTING TAG WRITING ON LOCAL ALBUMS")
         print("=" * 60)
         
-        # Find all audio files in the local directory
-        audio_files = []
-        for ext in ['*.flac', '*.mp3', '*.m4a']:
-            audio_files.extend(local_path.rglob(ext))
+        # Find all audio files, grouped by album (based on parent directory)
+        paths, albums = group_audio_by_album(local_path)
         
-        if not audio_files:
+        if not paths:
             print("No audio files found in local directory")
             return
         
-        # Group files by album (based on parent directory)
-        albums = {}
-        for file_path in audio_files:
-            album_dir = file_path.parent.name
-            if album_dir not in albums:
-                albums[album_dir] = []
-            albums[album_dir].append(file_path)
-        
-        print(f"Found {len(albums)} albums with {len(audio_files)} tracks")
+        print(f"Found {len(albums)} albums with {len(paths)} tracks")
         
         # Test each album
-        for album_name, files in albums.items():
+        for album_dir, idxs in albums.items():
+            album_name = os.path.basename(album_dir)
             print(f"\n📁 ALBUM: {album_name}")
-            print(f"   Tracks: {len(files)}")
+            print(f"   Tracks: {len(idxs)}")
             
             # Try to parse artist and album from directory name
-            # Common formats: "Artist - Album (Year)" or "Artist - Album"
-            if " - " in album_name:
-                parts = album_name.split(" - ", 1)
-                artist = parts[0].strip()
-                album = parts[1].strip()
-                
-                # Remove year and format info
-                album = album.split(" (")[0].strip()
-                album = album.split(" [")[0].strip()
-                
+            artist, album = parse_album_directory(album_name)
+            if artist:
                 print(f"   Parsed: {artist} - {album}")
                 
                 # Test genre assignment (simulate API result)
@@ -238,10 +628,10 @@ class TagWriter:
                 print(f"   Test Genres: {'; '.join(test_genres)}")
                 
                 # Test writing to first file only
-                if files:
-                    test_file = files[0]
+                if idxs:
+                    test_file = Path(paths[idxs[0]])
                     print(f"   Testing on: {test_file.name}")
-                    success = self.write_genre_tags(test_file, test_genres, test_mode=True)
+                    success = self._test_write(test_file, test_genres)
                     if success:
                         print(f"   ✓ Tag writing test successful")
                     else:
@@ -249,21 +639,187 @@ class TagWriter:
             else:
                 print(f"   ⚠️  Could not parse artist/album from directory name")
     
+    def update_local_albums(self, local_music_dir: str = None, test_mode: bool = True,
+                            genre_lookup: Optional[Callable[[str, str], List[str]]] = None,
+                            workers: Optional[int] = None, strict_per_file: bool = False,
+                            verbose: bool = True, use_cache: bool = True) -> int:
+        """Write genres to every track of every parseable album, in parallel
+        
+        genre_lookup(artist, album) supplies the genres; albums it has none
+        for are left alone. The simulated get_test_genres is only used as a
+        default in test mode, real writes refuse to run without a lookup
+        such as batch_results_lookup(). Files are written by a process pool since mutagen's
+        parsing and serializing is CPU-bound Python, or by a thread pool
+        when the library is on a network mount. Returns the number of
+        files that now carry the genres (written or already up to date).
+        
+        Tracks of an album normally share their genres, so the merge with
+        existing genres is done once per album from its first track (by
+        file name) and the result written to every track. strict_per_file
+        merges against each file's own genres instead, for albums whose
+        tracks differ.
+        
+        With use_cache, files whose genre is known from the tag cache and
+        which haven't changed since are neither read nor opened for writing
+        when they already hold the genres. The cache is only saved by real
+        writes; strict_per_file runs use it but don't add to it.
+        
+        Without verbose, workers print nothing per file and only a summary
+        of the written/unchanged/failed counts is shown.
+        """
+        if local_music_dir is None:
+            local_music_dir = self.music_path
+        if genre_lookup is None:
+            if not test_mode:
+                print("Refusing to write simulated genres; pass a genre lookup (e.g. batch_results_lookup)")
+                return 0
+            genre_lookup = self.get_test_genres
+        
+        local_path = Path(local_music_dir)
+        if not local_path.exists():
+            print(f"Local music directory not found: {local_path}")
+            return 0
+        
+        print("🏷️  UPDATING GENRE TAGS IN LOCAL ALBUMS")
+        print("=" * 60)
+        
+        # Find all audio files, grouped by album directory
+        pruned = []
+        paths, albums = group_audio_by_album(local_path, pruned)
+        if pruned and verbose:
+            print(f"Skipped {len(pruned)} non-audio directories (artwork, scans, hidden)")
+        
+        # Genre values of files untouched since the cache recorded them
+        cache_path = local_path / TAG_CACHE_FILENAME
+        known: Dict[int, Tuple[List[int], str]] = {}
+        if use_cache:
+            cache = load_tag_cache(cache_path)
+            for i, path in enumerate(paths):
+                entry = cache.get(path)
+                if entry and entry[:2] == _file_stamp(path):
+                    known[i] = (entry[:2], entry[2])
+        
+        # Look up each parseable album's new genres
+        plans = []
+        for album_dir, idxs in albums.items():
+            album_name = os.path.basename(album_dir)
+            artist, album = parse_album_directory(album_name)
+            if not artist:
+                print(f"⚠️  Could not parse artist/album from directory name: {album_name}")
+                continue
+            new_genres = genre_lookup(artist, album)
+            if not new_genres:
+                if verbose:
+                    print(f"No genres found for {artist} - {album}, skipping")
+                continue
+            plans.append((idxs, new_genres))
+        
+        # Survey every album's first track for its existing genres up front,
+        # with the reads overlapped; cached tracks need no read
+        if not strict_per_file:
+            first_tracks = [min(idxs, key=paths.__getitem__) for idxs, _ in plans]
+            unread = [i for i in first_tracks if i not in known]
+            read = dict(zip(unread, self.read_all_genres([Path(paths[i]) for i in unread])))
+            existing = [known[i][1] if i in known else read[i] for i in first_tracks]
+        
+        # One task per file, as plain strings/lists so pickling stays cheap;
+        # cached files already holding their genres are counted as unchanged
+        tasks = []
+        task_idxs = []
+        cached_unchanged = 0
+        for n, (idxs, new_genres) in enumerate(plans):
+            if not strict_per_file:
+                final_genres = self.merge_genres(existing[n], new_genres)
+                genre_string = "; ".join(final_genres)
+            for i in idxs:
+                if i in known:
+                    held = known[i][1]
+                    if strict_per_file:
+                        genre_string = "; ".join(self.merge_genres(held, new_genres))
+                    if held == genre_string:
+                        cached_unchanged += 1
+                        continue
+                    del known[i]
+                if strict_per_file:
+                    tasks.append((paths[i], new_genres, test_mode, True, verbose))
+                else:
+                    tasks.append((paths[i], final_genres, test_mode, False, verbose))
+                task_idxs.append(i)
+        
+        print(f"Writing genres to {len(tasks)} tracks in {len(albums)} albums")
+        if cached_unchanged and verbose:
+            print(f"Skipping {cached_unchanged} tracks already up to date (tag cache)")
+        
+        # Writes to a network mount wait on the server rather than the CPU,
+        # so threads give more overlap there than one process per core
+        if is_network_path(local_path):
+            executor_cls, default_workers = ThreadPoolExecutor, NETWORK_WRITE_THREADS
+            if verbose:
+                print(f"Library is on a network mount; writing with {workers or default_workers} threads")
+        else:
+            executor_cls, default_workers = ProcessPoolExecutor, os.cpu_count()
+        
+        with executor_cls(max_workers=workers or default_workers) as executor:
+            statuses = list(executor.map(_write_one, tasks, chunksize=8))
+        counts = Counter(statuses)
+        counts[UNCHANGED] += cached_unchanged
+        
+        # Files written or found up to date now hold exactly the task's
+        # genres; re-stat them so the entries match their new mtimes
+        if use_cache and not test_mode:
+            files = {paths[i]: [*stamp, genre] for i, (stamp, genre) in known.items()}
+            if not strict_per_file:
+                for (path, final_genres, *_), status in zip(tasks, statuses):
+                    stamp = _file_stamp(path) if status != FAILED else None
+                    if stamp:
+                        files[path] = [*stamp, "; ".join(final_genres)]
+            save_tag_cache(cache_path, files)
+        
+        verb = "Updated" if not test_mode else "Would update"
+        print(f"\n{verb} {counts[WRITTEN]}, unchanged {counts[UNCHANGED]}, "
+              f"failed {counts[FAILED]} of {len(tasks) + cached_unchanged} tracks")
+        return counts[WRITTEN] + counts[UNCHANGED]
+    
+    def _probe_genres(self, file_path: Path) -> str:
+        """Existing genre string of one file, '' if it can't be read"""
+        return self.read_current_tags(file_path).get('genre', '')
+    
+    def read_all_genres(self, file_paths: List[Path], max_workers: int = READ_CONCURRENCY) -> List[str]:
+        """Existing genre strings of many files, in order, read concurrently
+        
+        Tag reads are dominated by I/O latency on network mounts, so many
+        threads keep several requests in flight; the GIL is released while
+        they wait on the file system.
+        """
+        if len(file_paths) < 2:
+            return [self._probe_genres(file_path) for file_path in file_paths]
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            return list(pool.map(self._probe_genres, file_paths))
+    
+    def _test_write(self, file_path: Path, test_genres: List[str]) -> bool:
+        """Show a file's current genre, then dry-run the write on the same handle"""
+        try:
+            audio_file = self._load(file_path)
+            if audio_file is None:
+                print(f"Could not read audio file: {file_path}")
+                return False
+            
+            print(f"   Current Genre: {self._read(audio_file).get('genre') or 'None'}")
+            return self._write(audio_file, file_path, test_genres, test_mode=True) != FAILED
+            
+        except Exception as e:
+            print(f"Error writing tags to {file_path}: {e}")
+            return False
+    
     def get_test_genres(self, artist: str, album: str) -> List[str]:
         """Get test genres based on artist/album (simulated API result)"""
         # This simulates what we'd get from MusicBrainz API
         # In real implementation, this would come from API results
-        
-        test_genre_map = {
-            "annette brissett": ["Reggae", "Dancehall", "Caribbean"],
-            "ranking dread": ["Reggae", "Dub", "Jamaican"],
-            "tomorrow": ["Psychedelic Rock", "Rock", "1960s"]
-        }
-        
-        artist_lower = artist.lower()
-        for key, genres in test_genre_map.items():
-            if key in artist_lower:
-                return genres
+        for scanner, rules, name in ((_ARTIST_RE, ARTIST_RULES, artist),
+                                     (_ALBUM_RE, ALBUM_RULES, album)):
+            match = scanner.search(name.lower()) if scanner else None
+            if match:
+                return list(rules[match.group(0)])
         
         # Default test genres
         return ["Rock", "Alternative"]
@@ -271,33 +827,52 @@ class TagWriter:
     def read_current_tags(self, file_path: Path) -> Dict:
         """Read current tags from file"""
         try:
-            audio_file = File(file_path)
+            # FLAC comments are read straight from the metadata blocks
+            if file_path.suffix.lower() == '.flac':
+                comments = read_flac_comments(file_path)
+                if comments is not None:
+                    if not comments:
+                        return {}
+                    tags = {field: comments.get(field.upper(), [''])[0]
+                            for field in ('title', 'artist', 'album')}
+                    tags['genre'] = '; '.join(comments.get('GENRE', []))
+                    return tags
+            
+            audio_file = TagWriter._load(file_path, tags_only=True)
             if not audio_file:
                 return {}
             
-            tags = {}
-            if isinstance(audio_file, FLAC):
-                tags = {
-                    'genre': audio_file.get('GENRE', [''])[0],
-                    'title': audio_file.get('TITLE', [''])[0],
-                    'artist': audio_file.get('ARTIST', [''])[0],
-                    'album': audio_file.get('ALBUM', [''])[0]
-                }
-            elif isinstance(audio_file, MP3):
-                if audio_file.tags:
-                    tags = {
-                        'genre': str(audio_file.tags.get('TCON', '')),
-                        'title': str(audio_file.tags.get('TIT2', '')),
-                        'artist': str(audio_file.tags.get('TPE1', '')),
-                        'album': str(audio_file.tags.get('TALB', ''))
-                    }
-            
-            return tags
+            return TagWriter._read(audio_file)
             
         except Exception as e:
             print(f"Error reading tags from {file_path}: {e}")
             return {}
     
+    @staticmethod
+    def _read(audio_file) -> Dict:
+        """Read current tags from an already loaded mutagen handle"""
+        tags = {}
+        if isinstance(audio_file, FLAC):
+            tags = {
+                'genre': '; '.join(audio_file.get('GENRE', [])),
+                'title': audio_file.get('TITLE', [''])[0],
+                'artist': audio_file.get('ARTIST', [''])[0],
+                'album': audio_file.get('ALBUM', [''])[0]
+            }
+        elif isinstance(audio_file, (MP3, ID3)):
+            id3 = audio_file if isinstance(audio_file, ID3) else audio_file.tags
+            if id3:
+                # TCON's text list directly; str() would join with NULs
+                tcon = id3.get('TCON')
+                tags = {
+                    'genre': '; '.join(tcon.text) if tcon else '',
+                    'title': str(id3.get('TIT2', '')),
+                    'artist': str(id3.get('TPE1', '')),
+                    'album': str(id3.get('TALB', ''))
+                }
+        
+        return tags
+    
     def show_current_tags(self, local_music_dir: str = None) -> None:
         """Show current tags in local albums"""
         if local_music_dir is None:
@@ -311,12 +886,8 @@ class TagWriter:
         print("🏷️  CURRENT TAGS IN LOCAL ALBUMS")
         print("=" * 60)
         
-        # Find all audio files
-        audio_files = []
-        for ext in ['*.flac', '*.mp3', '*.m4a']:
-            audio_files.extend(local_path.rglob(ext))
-        
-        for file_path in audio_files[:10]:  # Show first 10 files
+        # Show first 10 files; the walk stops as soon as they are found
+        for file_path in map(Path, islice(iter_audio(local_path), 10)):
             tags = self.read_current_tags(file_path)
             print(f"\n📁 {file_path.parent.name}")
             print(f"   🎵 {file_path.name}")
@@ -326,10 +897,32 @@ class TagWriter:
     
 
 if __name__ == "__main__":
-    writer = TagWriter("/Volumes/T7/Albums")
+    import argparse
     
-    # Show current tags
-    writer.show_current_tags()
+    parser = argparse.ArgumentParser(description="Tag Writer - Safe genre tag writing")
+    parser.add_argument("music_path", nargs="?", default="/Volumes/T7/Albums", help="Path to music library")
+    parser.add_argument("--update", action="store_true", help="Write genres to every track (test mode unless --write)")
+    parser.add_argument("--write", action="store_true", help="Actually modify files with --update")
+    parser.add_argument("--genres-db", help="Take genres from this batch_processing.db's completed results "
+                                            "(required with --write)")
+    parser.add_argument("--strict-per-file", action="store_true",
+                        help="Merge with each file's own genres instead of once per album")
+    parser.add_argument("--quiet", action="store_true", help="Only print a summary with --update")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore and don't update the tag cache")
+    args = parser.parse_args()
+    if args.write and not args.genres_db:
+        parser.error("--write needs a real genre source; pass --genres-db batch_processing.db")
     
-    # Test tag writing
-    writer.test_local_albums()
\ No newline at end of file
+    writer = TagWriter(args.music_path)
+    
+    if args.update:
+        genre_lookup = batch_results_lookup(args.genres_db) if args.genres_db else None
+        writer.update_local_albums(test_mode=not args.write, genre_lookup=genre_lookup,
+                                   strict_per_file=args.strict_per_file,
+                                   verbose=not args.quiet, use_cache=not args.no_cache)
+    else:
+        # Show current tags
+        writer.show_current_tags()
+        
+        # Test tag writing
+        writer.test_local_albums()
\ No newline at end of file
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Tests for the batch processor's library analysis command
+"""
+
+import argparse
+
+import pytest
+
+pytest.importorskip("musicbrainzngs")
+pytest.importorskip("spotipy")
+
+TRACKS = [
+    {'Name': 'One', 'Artist': 'Alpha', 'Album': 'First', 'Genre': 'Rock'},
+    {'Name': 'Two', 'Artist': 'Alpha', 'Album': 'Second', 'Genre': 'Rock'},
+    {'Name': 'Three', 'Artist': 'Beta', 'Album': 'Third', 'Genre': 'Jazz'},
+    {'Name': 'Four', 'Artist': 'Gamma', 'Album': 'Fourth', 'Genre': ''},
+]
+
+def test_detailed_analysis_respects_limit(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    import batch_processor
+    processor = batch_processor.MusicLibraryProcessor(str(tmp_path))
+    
+    def fake_scan():
+        for track in TRACKS:
+            processor.scanner._process_album(track)
+    monkeypatch.setattr(processor.scanner, "scan_filesystem", fake_scan)
+    
+    requested = []
+    real_suggestions = processor.smart_assignment.get_smart_suggestions
+    def spy_suggestions(album_key, album_info):
+        requested.append(album_key)
+        return real_suggestions(album_key, album_info)
+    monkeypatch.setattr(processor.smart_assignment, "get_smart_suggestions", spy_suggestions)
+    
+    processor.cmd_analyze(argparse.Namespace(detailed=True, quality=False, limit=2))
+    
+    assert requested == ["Alpha|First", "Alpha|Second"]
+    output = capsys.readouterr().out
+    assert "Smart Genre Assignment Analysis (limited to 2)" in output
+    assert "Beta - Third" not in output
+    assert "Gamma - Fourth" not in output
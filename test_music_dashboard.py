@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Tests for the dashboard's JSON responses and conditional page requests
+"""
+
+import pytest
+
+
+def load_dashboard(tmp_path, monkeypatch):
+    """Import music_dashboard with its databases created in tmp_path"""
+    monkeypatch.chdir(tmp_path)
+    import music_dashboard
+    music_dashboard.dashboard = music_dashboard.MusicLibraryDashboard()
+    return music_dashboard
+
+
+def test_jsonify_is_encoded_by_orjson(tmp_path, monkeypatch):
+    orjson = pytest.importorskip("orjson")
+    md = load_dashboard(tmp_path, monkeypatch)
+    
+    encoded = []
+    real_dumps = orjson.dumps
+    
+    def spy_dumps(obj, *args, **kwargs):
+        encoded.append(obj)
+        return real_dumps(obj, *args, **kwargs)
+    
+    monkeypatch.setattr(md.orjson, "dumps", spy_dumps)
+    
+    with md.app.test_request_context():
+        response = md.jsonify({"b": 1, "a": [1.5, "Café"], 3: None})
+    
+    assert encoded == [{"b": 1, "a": [1.5, "Café"], 3: None}]
+    assert response.get_data(as_text=True) == '{"3":null,"a":[1.5,"Café"],"b":1}\n'
+
+def test_not_modified_page_keeps_etag_and_cache_headers(tmp_path, monkeypatch):
+    md = load_dashboard(tmp_path, monkeypatch)
+    client = md.app.test_client()
+    
+    page = client.get("/albums")
+    assert page.status_code == 200
+    etag = page.headers["ETag"]
+    
+    cached = client.get("/albums", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.headers["ETag"] == etag
+    assert cached.headers["Cache-Control"] == page.headers["Cache-Control"] == "no-cache"
+
+def test_pooled_connections_use_wal_and_busy_timeout(tmp_path, monkeypatch):
+    md = load_dashboard(tmp_path, monkeypatch)
+    for get_connection in (md.dashboard.get_connection, md.dashboard.get_albums_connection):
+        with get_connection() as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 30000
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Tests for where the tag writer takes the genres it writes from
+"""
+
+import json
+import sqlite3
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("mutagen")
+
+import tag_writer
+
+def test_write_refuses_without_genre_lookup(tmp_path, capsys):
+    album_dir = tmp_path / "Alpha - First"
+    album_dir.mkdir()
+    (album_dir / "01.flac").write_bytes(b"")
+    
+    writer = tag_writer.TagWriter(str(tmp_path))
+    assert writer.update_local_albums(test_mode=False) == 0
+    assert "Refusing to write simulated genres" in capsys.readouterr().out
+    assert (album_dir / "01.flac").read_bytes() == b""
+
+def test_cli_write_needs_genres_db(tmp_path):
+    result = subprocess.run([sys.executable, str(Path(tag_writer.__file__)), str(tmp_path), "--update", "--write"],
+                            capture_output=True, text=True)
+    assert result.returncode == 2
+    assert "--genres-db" in result.stderr
+
+def test_batch_results_lookup_uses_latest_completed_result(tmp_path):
+    db_path = tmp_path / "batch_processing.db"
+    conn = sqlite3.connect(db_path)
+    conn.execute("""
+        CREATE TABLE album_results (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            artist TEXT, album TEXT, final_genres TEXT, status TEXT
+        )
+    """)
+    conn.executemany("INSERT INTO album_results (artist, album, final_genres, status) VALUES (?, ?, ?, ?)", [
+        ("Alpha", "First", json.dumps(["Rock"]), "completed"),
+        ("Alpha", "First", json.dumps(["Shoegaze", "Rock"]), "completed"),
+        ("Alpha", "First", json.dumps(["Polka"]), "needs_review"),
+        ("Beta", "Second", json.dumps(["Jazz"]), "failed"),
+    ])
+    conn.commit()
+    conn.close()
+    
+    lookup = tag_writer.batch_results_lookup(db_path)
+    assert lookup("alpha", "FIRST") == ["Shoegaze", "Rock"]
+    assert lookup("Beta", "Second") == []
+    assert lookup("Gamma", "Third") == []